@@ -141,7 +141,7 @@ class MongoJobDataCollector:
             salary=job_data.get('salary', ''),
             requirements=job_data.get('requirements', []),
             skills=skills,
-            experience_level=job_data.get('experience_level', ''),
+            experience_level=job_data.get('experience_level') or None,
             job_type=job_data.get('job_type', ''),
             remote=job_data.get('remote_friendly', None),
             source=source,
@@ -219,7 +219,7 @@ class MongoJobDataCollector:
         """Get collection statistics from MongoDB"""
         
         stats = await self.job_ops.get_job_stats()
-        recent_sessions = await self.scraping_ops.get_recent_scraping_sessions(5)
+        recent_sessions = await self.scraping_ops.get_recent_scraping_sessions(5, projection={"started_at": 1})
         
         return {
             "total_jobs": stats.get("total_jobs", 0),
@@ -303,7 +303,7 @@ if __name__ == "__main__":
         # Collect jobs
         results = await collector.collect_from_scraper(
             scraped_jobs=test_jobs,
-            source="test_source",
+            source="linkedin",
             keywords=["python", "developer"]
         )
         
@@ -0,0 +1,74 @@
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class AsyncTTLCache:
+    """In-process LRU cache with per-entry TTL and single-flight fetches"""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        # Concurrent callers for the same key share one in-flight fetch
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finish, key))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+def ttl_cached(
+    ttl: float = 30.0,
+    maxsize: int = 128,
+    key: Optional[Callable[..., Hashable]] = None,
+    copy: Optional[Callable[[Any], Any]] = None
+):
+    """Cache an async function's results for `ttl` seconds.
+
+    Without a `key` function the cache key is built from the operations
+    instance (the first argument), the remaining positional arguments and
+    the kwargs. With `copy` every caller gets its own copy of the cached value.
+    """
+    def decorator(func):
+        cache = AsyncTTLCache(maxsize=maxsize, ttl=ttl)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if key is not None:
+                cache_key = key(*args, **kwargs)
+            else:
+                cache_key = (id(args[0]), args[1:], tuple(sorted(kwargs.items())))
+            value = await cache.get_or_fetch(cache_key, lambda: func(*args, **kwargs))
+            return copy(value) if copy is not None else value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -1,8 +1,8 @@
 import os
 import asyncio
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
-from pymongo import MongoClient
+from pymongo import MongoClient, IndexModel, ASCENDING, DESCENDING, TEXT
 from pymongo.database import Database
 from pymongo.collection import Collection
 import logging
@@ -10,7 +10,9 @@ import logging
 logger = logging.getLogger(__name__)
 
 _async_client: Optional[AsyncIOMotorClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
 _sync_client: Optional[MongoClient] = None
+_unique_confirmed: Dict[Tuple[str, str], bool] = {}
 
 
 class DatabaseConfig:
@@ -49,11 +51,15 @@ _config = DatabaseConfig()
 
 
 async def get_async_client() -> AsyncIOMotorClient:
-    global _async_client
+    """Get async MongoDB client (one per event loop; Motor clients are loop-bound)"""
+    global _async_client, _async_client_loop
     
-    if _async_client is None:
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
         connection_string = _config.get_connection_string()
+        # Published before the ping so concurrent first callers share this client
         _async_client = AsyncIOMotorClient(connection_string)
+        _async_client_loop = loop
         
         try:
             await _async_client.admin.command('ping')
@@ -110,11 +116,12 @@ def get_collection(collection_name: str) -> Collection:
 
 async def close_connections():
     """Close all database connections"""
-    global _async_client, _sync_client
+    global _async_client, _async_client_loop, _sync_client
     
     if _async_client:
         _async_client.close()
         _async_client = None
+        _async_client_loop = None
     
     if _sync_client:
         _sync_client.close()
@@ -123,66 +130,125 @@ async def close_connections():
     logger.info("🔌 Database connections closed")
 
 
-async def setup_database():
-    """Setup database with indexes and initial configuration"""
+# Every filter/sort combination the operations layer issues, declared once.
+# Mongo allows a single text index per collection, so each gets exactly one.
+INDEX_MODELS = {
+    "jobs": [
+        IndexModel([("url", ASCENDING)], unique=True),  # Upsert / dedupe key
+        IndexModel([("company", ASCENDING)]),
+        IndexModel([("location", ASCENDING)]),
+        IndexModel([("location_lc", ASCENDING)]),  # Case-insensitive location prefix filter
+        IndexModel([("source", ASCENDING), ("created_at", DESCENDING)]),  # get_jobs_by_source
+        IndexModel([("language", ASCENDING)]),
+        IndexModel([("experience_level", ASCENDING)]),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),  # Recent jobs / keyset pagination
+        IndexModel([("title", TEXT), ("description", TEXT), ("company", TEXT)], name="job_text_idx"),
+    ],
+    "training_examples": [
+        IndexModel([("example_id", ASCENDING)], unique=True),
+        IndexModel([("language", ASCENDING), ("source", ASCENDING)]),
+        IndexModel([("created_at", DESCENDING)]),
+    ],
+    "user_interactions": [
+        IndexModel([("user_id", ASCENDING), ("timestamp", DESCENDING)]),
+        IndexModel([("session_id", ASCENDING)]),
+        IndexModel([("timestamp", DESCENDING)]),
+        IndexModel([("message", TEXT)], name="interaction_text_idx"),
+    ],
+    "chat_histories": [
+        IndexModel([("chat_id", ASCENDING)], unique=True),  # save_chat upserts on chat_id
+        IndexModel([("user_id", ASCENDING), ("last_activity", DESCENDING)]),  # get_user_chats
+        IndexModel([("title", TEXT), ("messages.content", TEXT)], name="chat_text_idx"),
+    ],
+    "models": [
+        IndexModel([("name", ASCENDING), ("is_active", ASCENDING)]),  # get_active_model
+        IndexModel([("name", ASCENDING), ("created_at", DESCENDING)]),  # get_model_versions
+        IndexModel([("version", ASCENDING)]),
+        IndexModel([("languages", ASCENDING)]),
+    ],
+    "scraping_sessions": [
+        IndexModel([("source", ASCENDING)]),
+        IndexModel([("started_at", DESCENDING)]),
+        IndexModel([("status", ASCENDING)]),
+    ],
+}
+
+
+async def ensure_indexes():
+    """Create the declared indexes; existing ones are a no-op on the server"""
     db = await get_async_database()
     
-    # Create collections with indexes
-    collections_setup = {
-        "jobs": [
-            ("url", 1),  # Unique job URL
-            ("title", "text"),  # Text search on title
-            ("company", 1),  # Company filter
-            ("location", 1),  # Location filter
-            ("source", 1),  # Source filter
-            ("language", 1),  # Language filter
-            ("created_at", -1),  # Sort by date
-            ([("title", "text"), ("description", "text"), ("company", "text")], None),  # Full text search
-        ],
-        "training_examples": [
-            ("example_id", 1),  # Unique example ID
-            ("source", 1),  # Data source
-            ("created_at", -1),  # Sort by date
-            ("language", 1),  # Language filter
-        ],
-        "user_interactions": [
-            ("user_id", 1),  # User filter
-            ("session_id", 1),  # Session filter
-            ("timestamp", -1),  # Sort by time
-            ("message", "text"),  # Text search
-        ],
-        "models": [
-            ("name", 1),  # Model name
-            ("version", 1),  # Model version
-            ("created_at", -1),  # Sort by date
-            ("languages", 1),  # Language support
-        ],
-        "scraping_sessions": [
-            ("source", 1),  # Source filter
-            ("started_at", -1),  # Sort by date
-            ("status", 1),  # Status filter
-        ]
-    }
-    
-    for collection_name, indexes in collections_setup.items():
+    for collection_name, index_models in INDEX_MODELS.items():
         collection = db[collection_name]
-        
-        for index in indexes:
-            try:
-                if isinstance(index, tuple) and len(index) == 2:
-                    index_spec, index_type = index
-                    if index_type == "text":
-                        await collection.create_index([(index_spec, "text")])
-                    elif isinstance(index_spec, list):
-                        # Compound text index
-                        await collection.create_index(index_spec)
-                    else:
-                        await collection.create_index(index_spec)
-                else:
-                    await collection.create_index(index)
-            except Exception as e:
-                logger.warning(f"Index creation failed for {collection_name}: {e}")
+        await rebuild_non_unique_indexes(collection, index_models)
+        try:
+            await collection.create_indexes(index_models)
+        except Exception:
+            # One bad index (e.g. duplicates blocking a unique one) fails the whole
+            # batch, so retry individually to keep the rest
+            for index_model in index_models:
+                try:
+                    await collection.create_indexes([index_model])
+                except Exception as e:
+                    logger.warning(f"Index creation failed for {collection_name} {index_model.document['key']}: {e}")
     
+    # Re-read index state on next use now that the unique indexes may have changed
+    _unique_confirmed.clear()
+    await backfill_location_lc(db)
+
+
+async def rebuild_non_unique_indexes(collection, index_models):
+    """Replace same-named non-unique indexes (from older setups) with the declared unique ones.
+
+    create_indexes treats a same-named index with different options as a
+    conflict, so these would otherwise stay non-unique and let duplicates in.
+    """
+    existing = await collection.index_information()
+    for index_model in index_models:
+        document = index_model.document
+        name = document["name"]
+        if not document.get("unique") or name not in existing or existing[name].get("unique"):
+            continue
+        
+        logger.warning(f"Rebuilding non-unique index {collection.name}.{name} as unique")
+        await collection.drop_index(name)
+        try:
+            await collection.create_indexes([index_model])
+        except Exception as e:
+            # Duplicates already stored block the unique index; keep lookups fast and
+            # leave the operations on their existence checks until they are cleaned up
+            logger.error(f"Cannot make {collection.name}.{name} unique, remove the duplicates and restart: {e}")
+            await collection.create_index(list(document["key"].items()), name=name)
+
+
+async def unique_index_confirmed(collection, field: str) -> bool:
+    """Whether the collection has a unique single-field index on field"""
+    key = (collection.name, field)
+    if key not in _unique_confirmed:
+        indexes = await collection.index_information()
+        _unique_confirmed[key] = any(
+            spec.get("unique") and [name for name, _ in spec["key"]] == [field]
+            for spec in indexes.values()
+        )
+    return _unique_confirmed[key]
+
+
+async def backfill_location_lc(db):
+    """Add location_lc to jobs stored before it was written; a no-op once all have it"""
+    try:
+        result = await db.jobs.update_many(
+            {"location_lc": {"$exists": False}},
+            [{"$set": {"location_lc": {"$toLower": "$location"}}}]
+        )
+        if result.modified_count:
+            logger.info(f"Backfilled location_lc on {result.modified_count} jobs")
+    except Exception as e:
+        logger.warning(f"location_lc backfill failed: {e}")
+
+
+async def setup_database():
+    """Setup database with indexes and initial configuration"""
+    await ensure_indexes()
     logger.info("📊 Database setup completed")
 
 
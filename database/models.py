@@ -1,6 +1,10 @@
-from datetime import datetime
-from typing import Optional, List, Dict, Any, Union, Annotated
-from pydantic import BaseModel, Field, BeforeValidator
+import time
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Union, Annotated, Literal, ClassVar, Set
+from pydantic import (
+    BaseModel, Field, BeforeValidator, PlainSerializer,
+    ConfigDict, computed_field
+)
 from bson import ObjectId
 from enum import Enum
 
@@ -17,7 +21,117 @@ def validate_object_id(v: Any) -> ObjectId:
 PyObjectId = Annotated[ObjectId, BeforeValidator(validate_object_id)]
 
 
-class JobPosting(BaseModel):
+def now_epoch_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def to_epoch_ms(v: Any) -> Any:
+    if isinstance(v, datetime):
+        if v.tzinfo is None:
+            # Mongo hands back naive UTC datetimes
+            v = v.replace(tzinfo=timezone.utc)
+        return int(v.timestamp() * 1000)
+    return v
+
+
+def from_epoch_ms(ms: int) -> datetime:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+# Timestamps are held as int epoch-ms inside the models (cheap to compare and
+# sort) and converted back to datetime only when dumped for Mongo / the API
+EpochMs = Annotated[
+    int,
+    BeforeValidator(to_epoch_ms),
+    PlainSerializer(from_epoch_ms, return_type=datetime),
+]
+
+
+def normalize_code(v: Any) -> Any:
+    return v.lower() if isinstance(v, str) else v
+
+
+# Closed vocabularies, checked by pydantic-core instead of app-level helpers
+LangCode = Annotated[
+    Literal["english", "georgian", "russian", "armenian"],
+    BeforeValidator(normalize_code),
+]
+SourceCode = Annotated[
+    Literal["linkedin", "indeed", "glassdoor", "hr.ge", "jobs.ge", "synthetic", "scraped", "unknown"],
+    BeforeValidator(normalize_code),
+]
+LevelCode = Annotated[
+    Literal["entry", "junior", "mid", "senior", "lead", "executive", "any"],
+    BeforeValidator(normalize_code),
+]
+
+
+# Config for read-mostly DTOs loaded from trusted sources (our own DB):
+# keep the validator chain per field as thin as possible
+TRUSTED_MODEL_CONFIG = ConfigDict(
+    validate_default=False,
+    str_strip_whitespace=False,
+    str_to_lower=False,
+    validate_assignment=False,
+    populate_by_name=True,
+    arbitrary_types_allowed=True,
+)
+
+
+class MongoModel(BaseModel):
+    """Base for stored documents; `to_mongo` is the single write-side serializer"""
+    
+    # Mongo assigns _id on insert
+    _WRITE_EXCLUDE: ClassVar[Set[str]] = {"id"}
+    
+    def to_mongo(self) -> Dict[str, Any]:
+        """Document ready for insert_one / insert_many"""
+        return self.model_dump(exclude=self._WRITE_EXCLUDE)
+
+
+class TrainingConfig(BaseModel):
+    """Training hyperparameters recorded with a model"""
+    
+    num_train_epochs: int = Field(default=3)
+    learning_rate: float = Field(default=2e-4)
+    per_device_train_batch_size: int = Field(default=1)
+    gradient_accumulation_steps: int = Field(default=1)
+    warmup_steps: int = Field(default=0)
+    weight_decay: float = Field(default=0.0)
+    max_grad_norm: float = Field(default=1.0)
+    model_max_length: Optional[int] = Field(None)
+    
+    # LoRA settings
+    lora_r: Optional[int] = Field(None)
+    lora_alpha: Optional[int] = Field(None)
+    lora_dropout: Optional[float] = Field(None)
+    lora_target_modules: List[str] = Field(default_factory=list)
+    
+    model_config = {"protected_namespaces": ()}
+
+
+class ExtractedRequirements(BaseModel):
+    """Job requirements extracted from a user message"""
+    
+    keywords: Union[str, List[str]] = Field(default_factory=list)
+    location: Optional[str] = Field(default="")
+    experience_level: Optional[str] = Field(default="any")
+    job_type: Optional[str] = Field(default="any")
+    salary_min: Optional[Union[int, float, str]] = Field(None)
+    skills: List[str] = Field(default_factory=list)
+    company_type: Optional[str] = Field(default="any")
+
+
+class QueryInfo(BaseModel):
+    """Query analysis attached to job search responses"""
+    
+    query: Optional[str] = Field(None)
+    filters_applied: int = Field(default=0)
+    languages: List[str] = Field(default_factory=list)
+    location: Optional[str] = Field(None)
+
+
+class JobPosting(MongoModel):
     
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
     url: str = Field(..., description="Unique job posting URL")
@@ -28,28 +142,43 @@ class JobPosting(BaseModel):
     salary: Optional[str] = Field(None, description="Salary information")
     requirements: Optional[List[str]] = Field(default_factory=list, description="Job requirements")
     skills: Optional[List[str]] = Field(default_factory=list, description="Required skills")
-    experience_level: Optional[str] = Field(None, description="Experience level required")
+    experience_level: Optional[LevelCode] = Field(None, description="Experience level required")
     job_type: Optional[str] = Field(None, description="Job type (full-time, part-time, etc.)")
     remote: Optional[bool] = Field(None, description="Remote work availability")
     
     # Metadata
-    source: str = Field(..., description="Data source (LinkedIn, Indeed, etc.)")
-    language: str = Field(default="english", description="Content language")
+    source: SourceCode = Field(..., description="Data source (LinkedIn, Indeed, etc.)")
+    language: LangCode = Field(default="english", description="Content language")
     country: Optional[str] = Field(None, description="Country")
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: Optional[datetime] = Field(None)
-    scraped_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: EpochMs = Field(default_factory=now_epoch_ms)
+    updated_at: Optional[EpochMs] = Field(None)
+    scraped_at: EpochMs = Field(default_factory=now_epoch_ms)
     
     # Analysis
     quality_score: Optional[float] = Field(None, ge=0, le=1, description="Data quality score")
     match_keywords: Optional[List[str]] = Field(default_factory=list)
     
-    model_config = {"populate_by_name": True, "arbitrary_types_allowed": True}
+    model_config = TRUSTED_MODEL_CONFIG
+    
+    @computed_field
+    @property
+    def location_lc(self) -> str:
+        """Lowercased location, stored alongside the job for indexed prefix filters"""
+        return self.location.lower()
+    
+    @classmethod
+    def from_mongo(cls, doc: Dict[str, Any]) -> "JobPosting":
+        """Build from a stored document without validation; only timestamps are coerced"""
+        data = dict(doc)
+        for key in ("created_at", "updated_at", "scraped_at"):
+            if key in data:
+                data[key] = to_epoch_ms(data[key])
+        return cls.model_construct(**data)
 
 
-class TrainingExample(BaseModel):
+class TrainingExample(MongoModel):
     
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
     example_id: str = Field(..., description="Unique example identifier")
@@ -61,7 +190,7 @@ class TrainingExample(BaseModel):
     
     # Metadata
     source: str = Field(..., description="Data source (synthetic, real, etc.)")
-    language: str = Field(default="english", description="Content language")
+    language: LangCode = Field(default="english", description="Content language")
     task_type: str = Field(..., description="Training task type")
     
     # Related job posting
@@ -77,7 +206,7 @@ class TrainingExample(BaseModel):
     model_config = {"populate_by_name": True, "arbitrary_types_allowed": True}
 
 
-class UserInteraction(BaseModel):
+class UserInteraction(MongoModel):
     """User interaction model for chat logs"""
     
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
@@ -92,12 +221,12 @@ class UserInteraction(BaseModel):
     message_type: str = Field(default="query", description="Message type")
     
     # Extracted information
-    extracted_requirements: Optional[Dict[str, Any]] = Field(None)
+    extracted_requirements: Optional[ExtractedRequirements] = Field(None)
     matched_jobs: Optional[List[PyObjectId]] = Field(default_factory=list)
     search_results_count: Optional[int] = Field(None)
     
     # Context
-    language: str = Field(default="english", description="Message language")
+    language: LangCode = Field(default="english", description="Message language")
     user_agent: Optional[str] = Field(None)
     ip_address: Optional[str] = Field(None)
     
@@ -106,12 +235,12 @@ class UserInteraction(BaseModel):
     satisfaction_score: Optional[float] = Field(None, ge=0, le=1)
     
     # Timestamps
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: EpochMs = Field(default_factory=now_epoch_ms)
     
     model_config = {"populate_by_name": True, "arbitrary_types_allowed": True}
 
 
-class ModelInfo(BaseModel):
+class ModelInfo(MongoModel):
     """Model training and metadata information"""
     
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
@@ -122,8 +251,8 @@ class ModelInfo(BaseModel):
     base_model: str = Field(..., description="Base model used")
     
     # Training configuration
-    languages: List[str] = Field(..., description="Supported languages")
-    training_config: Dict[str, Any] = Field(..., description="Training configuration")
+    languages: List[LangCode] = Field(..., description="Supported languages")
+    training_config: TrainingConfig = Field(..., description="Training configuration")
     gpu_used: Optional[str] = Field(None, description="GPU used for training")
     
     # Training metrics
@@ -153,13 +282,13 @@ class ModelInfo(BaseModel):
     model_config = {"populate_by_name": True, "arbitrary_types_allowed": True, "protected_namespaces": ()}
 
 
-class ScrapingSession(BaseModel):
+class ScrapingSession(MongoModel):
     """Scraping session tracking"""
     
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
     
     # Session info
-    source: str = Field(..., description="Scraping source")
+    source: SourceCode = Field(..., description="Scraping source")
     keywords: List[str] = Field(..., description="Search keywords")
     location: Optional[str] = Field(None, description="Search location")
     
@@ -191,17 +320,17 @@ class ChatMessage(BaseModel):
     message_id: str = Field(..., description="Unique message identifier")
     content: str = Field(..., description="Message content")
     sender: str = Field(..., description="Message sender (user/bot)")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: EpochMs = Field(default_factory=now_epoch_ms)
     
     # Additional data for bot messages
     jobs: Optional[List[Dict[str, Any]]] = Field(default_factory=list, description="Job results if any")
     total_jobs: Optional[int] = Field(None, description="Total jobs found")
     response_time_ms: Optional[float] = Field(None, description="Response time in milliseconds")
     
-    model_config = {"populate_by_name": True, "arbitrary_types_allowed": True}
+    model_config = TRUSTED_MODEL_CONFIG
 
 
-class ChatHistory(BaseModel):
+class ChatHistory(MongoModel):
     """Chat history model for conversation storage"""
     
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
@@ -216,7 +345,7 @@ class ChatHistory(BaseModel):
     message_count: int = Field(default=0, description="Total message count")
     
     # Metadata
-    language: str = Field(default="english", description="Primary language")
+    language: LangCode = Field(default="english", description="Primary language")
     tags: Optional[List[str]] = Field(default_factory=list, description="Chat tags/categories")
     
     # Statistics
@@ -229,31 +358,48 @@ class ChatHistory(BaseModel):
     is_archived: bool = Field(default=False, description="Is chat archived")
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-    last_activity: datetime = Field(default_factory=datetime.utcnow)
+    created_at: EpochMs = Field(default_factory=now_epoch_ms)
+    updated_at: EpochMs = Field(default_factory=now_epoch_ms)
+    last_activity: EpochMs = Field(default_factory=now_epoch_ms)
     
-    model_config = {"populate_by_name": True, "arbitrary_types_allowed": True}
+    model_config = TRUSTED_MODEL_CONFIG
+
+
+# Models whose validators reshape stored data (epoch-ms timestamps, nested
+# sub-models) and so cannot skip validation on trusted reads
+_VALIDATED_MODELS = frozenset({UserInteraction, ModelInfo, ChatMessage, ChatHistory})
+
+
+def cached_construct(cls, data: Dict[str, Any]):
+    """Build a model from trusted data, validating only where it matters"""
+    if hasattr(cls, "from_mongo"):
+        return cls.from_mongo(data)
+    if cls in _VALIDATED_MODELS:
+        return cls.model_validate(data)
+    return cls.model_construct(**data)
 
 
 # Utility models for API responses
 class JobSearchRequest(BaseModel):
     """Job search request model"""
     query: str = Field(..., description="Search query")
-    languages: List[str] = Field(default=["english"], description="Languages to search")
+    languages: List[LangCode] = Field(default=["english"], description="Languages to search")
     location: Optional[str] = Field(None, description="Location filter")
-    experience_level: Optional[str] = Field(None, description="Experience level filter")
+    experience_level: Optional[LevelCode] = Field(None, description="Experience level filter")
     remote_only: Optional[bool] = Field(None, description="Remote jobs only")
     limit: int = Field(default=20, ge=1, le=100, description="Results limit")
     offset: int = Field(default=0, ge=0, description="Results offset")
+    cursor: Optional[str] = Field(None, description="Opaque keyset cursor from a previous response (date-sorted searches)")
+    exact_count: bool = Field(default=True, description="Exact total count; otherwise an estimated collection-wide upper bound")
 
 
 class JobSearchResponse(BaseModel):
     """Job search response model"""
     jobs: List[JobPosting] = Field(..., description="Found jobs")
     total_count: int = Field(..., description="Total jobs matching query")
-    query_info: Dict[str, Any] = Field(..., description="Query analysis")
+    query_info: QueryInfo = Field(..., description="Query analysis")
     search_time_ms: float = Field(..., description="Search time in milliseconds")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
 
 
 class ChatExportRequest(BaseModel):
@@ -286,32 +432,3 @@ class DatabaseStats(BaseModel):
     job_sources: List[str]
     last_scraping_session: Optional[datetime]
     database_size_mb: Optional[float]
-
-
-# Validation functions
-def validate_language(language: str) -> str:
-    """Validate language code"""
-    supported_languages = ["english", "georgian", "russian", "armenian"]
-    if language.lower() not in supported_languages:
-        raise ValueError(f"Unsupported language: {language}")
-    return language.lower()
-
-
-def validate_job_source(source: str) -> str:
-    """Validate job source"""
-    supported_sources = ["linkedin", "indeed", "glassdoor", "hr.ge", "jobs.ge", "synthetic"]
-    if source.lower() not in supported_sources:
-        raise ValueError(f"Unsupported job source: {source}")
-    return source.lower()
-
-
-def validate_experience_level(level: str) -> str:
-    """Validate experience level"""
-    supported_levels = ["entry", "junior", "mid", "senior", "lead", "executive"]
-    if level.lower() not in supported_levels:
-        raise ValueError(f"Unsupported experience level: {level}")
-    return level.lower()
-
-
-# Note: Validators would need to be implemented differently in Pydantic v2
-# For now, validation is handled at the application level 
\ No newline at end of file
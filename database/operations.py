@@ -1,25 +1,69 @@
 import asyncio
+import base64
+import json
+import re
+import time
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Union
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Union, Tuple, AsyncIterator
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument, UpdateOne
 from pymongo.errors import DuplicateKeyError, BulkWriteError
 
-from .connection import get_async_collection, get_collection
+from .cache import ttl_cached
+from .connection import get_async_collection, get_collection, unique_index_confirmed
 from .models import (
     JobPosting, TrainingExample, UserInteraction, 
     ModelInfo, ScrapingSession, JobSearchRequest,
-    JobSearchResponse, DatabaseStats
+    JobSearchResponse, DatabaseStats, QueryInfo,
+    cached_construct, to_epoch_ms, from_epoch_ms
 )
 
 
+# Heavy fields left out of job list/preview payloads
+JOB_PREVIEW_PROJECTION = {"description": 0, "requirements": 0, "match_keywords": 0}
+
+
+@lru_cache(maxsize=4096)
+def parse_iso_timestamp(value: str) -> datetime:
+    """Parse a client ISO-8601 timestamp; cached since chats resend the same ones every save"""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
+def message_key(msg_data: Dict[str, Any]) -> str:
+    """Message id as sent by the frontend (`id`) or as stored (`message_id`)"""
+    return msg_data.get("id", msg_data.get("message_id", ""))
+
+
+def encode_job_cursor(created_at: datetime, job_id: ObjectId) -> str:
+    """Encode a (created_at, _id) keyset position as an opaque cursor"""
+    raw = json.dumps({"ts": to_epoch_ms(created_at), "id": str(job_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_job_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decode a cursor produced by encode_job_cursor"""
+    data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return from_epoch_ms(data["ts"]), ObjectId(data["id"])
+
+
 class BaseOperations:
     
     def __init__(self, collection_name: str):
         self.collection_name = collection_name
+        self._collection: Optional[AsyncIOMotorCollection] = None
+        self._collection_loop: Optional[asyncio.AbstractEventLoop] = None
     
     async def get_collection(self) -> AsyncIOMotorCollection:
-        return await get_async_collection(self.collection_name)
+        # Resolved once per event loop, matching the shared client in connection.py
+        loop = asyncio.get_running_loop()
+        if self._collection is None or self._collection_loop is not loop:
+            self._collection = await get_async_collection(self.collection_name)
+            self._collection_loop = loop
+        return self._collection
     
     def get_sync_collection(self):
         return get_collection(self.collection_name)
@@ -27,6 +71,14 @@ class BaseOperations:
     async def count_documents(self, filter_dict: Dict = None) -> int:
         collection = await self.get_collection()
         return await collection.count_documents(filter_dict or {})
+    
+    async def new_keys(self, field: str, keys: List[Any]) -> set:
+        """The keys not stored yet; skips the lookup once a unique index guards field"""
+        collection = await self.get_collection()
+        if await unique_index_confirmed(collection, field):
+            return set(keys)
+        existing = await collection.distinct(field, {field: {"$in": keys}})
+        return set(keys) - set(existing)
 
 
 class JobOperations(BaseOperations):
@@ -39,101 +91,173 @@ class JobOperations(BaseOperations):
         """Create a new job posting"""
         collection = await self.get_collection()
         
-        # Check for duplicates by URL
-        existing = await collection.find_one({"url": job.url})
-        if existing:
-            # Update existing job
-            await collection.update_one(
-                {"url": job.url},
-                {"$set": job.dict(exclude={"id", "created_at"})}
-            )
-            return str(existing["_id"])
+        # Single round-trip upsert keyed on the unique URL index
+        job_dict = job.to_mongo()
+        created_at = job_dict.pop("created_at")
+        doc = await collection.find_one_and_update(
+            {"url": job.url},
+            {"$set": job_dict, "$setOnInsert": {"created_at": created_at}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+            projection={"_id": 1}
+        )
+        return str(doc["_id"])
+    
+    async def bulk_create_jobs(self, jobs: List[JobPosting]) -> int:
+        """Bulk insert job postings; URLs already stored are skipped, not updated"""
+        collection = await self.get_collection()
         
-        # Create new job
-        job_dict = job.dict(exclude={"id"})
-        result = await collection.insert_one(job_dict)
-        return str(result.inserted_id)
+        # Remove duplicates within the batch (first occurrence of each URL wins)
+        by_url = {}
+        for job in jobs:
+            by_url.setdefault(job.url, job)
+        new_urls = await self.new_keys("url", list(by_url))
+        unique_jobs = [job.to_mongo() for url, job in by_url.items() if url in new_urls]
+        
+        if not unique_jobs:
+            return 0
+        
+        try:
+            result = await collection.insert_many(
+                unique_jobs, ordered=False, bypass_document_validation=True
+            )
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            # Unordered insert keeps going past duplicate URLs; count what landed
+            return e.details.get("nInserted", 0)
     
     async def get_job(self, job_id: str) -> Optional[JobPosting]:
         """Get job by ID"""
         collection = await self.get_collection()
         doc = await collection.find_one({"_id": ObjectId(job_id)})
-        return JobPosting(**doc) if doc else None
+        return cached_construct(JobPosting, doc) if doc else None
     
     async def get_job_by_url(self, url: str) -> Optional[JobPosting]:
         """Get job by URL"""
         collection = await self.get_collection()
         doc = await collection.find_one({"url": url})
-        return JobPosting(**doc) if doc else None
-    
+        return cached_construct(JobPosting, doc) if doc else None
+    
+    @ttl_cached(
+        ttl=30,
+        maxsize=256,
+        key=lambda self, request: (id(self), request.model_dump_json()),
+        copy=lambda response: response.model_copy(deep=True)
+    )
     async def search_jobs(self, request: JobSearchRequest) -> JobSearchResponse:
         """Search jobs with filters"""
         collection = await self.get_collection()
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
-        # Build search query
+        # Build search query, counting filters as they are added
         query = {}
+        filters_applied = 0
         
-        # Text search
-        if request.query:
+        # Text search (relevance-sorted, so it also decides sort and paging below)
+        is_text_search = bool(request.query)
+        if is_text_search:
             query["$text"] = {"$search": request.query}
+            filters_applied += 1
         
         # Language filter
         if request.languages:
             query["language"] = {"$in": request.languages}
+            filters_applied += 1
         
-        # Location filter
+        # Location filter (anchored prefix on the lowercased copy can use its index)
         if request.location:
-            query["location"] = {"$regex": request.location, "$options": "i"}
+            query["location_lc"] = {"$regex": f"^{re.escape(request.location.lower())}"}
+            filters_applied += 1
         
         # Experience level filter
         if request.experience_level:
             query["experience_level"] = request.experience_level
+            filters_applied += 1
         
         # Remote filter
         if request.remote_only:
             query["remote"] = True
+            filters_applied += 1
         
-        # Get total count
-        total_count = await collection.count_documents(query)
+        # Sort by relevance (text score) if text search, otherwise by date
+        if is_text_search:
+            sort = {"score": {"$meta": "textScore"}}
+        else:
+            sort = {"created_at": -1, "_id": -1}
+        
+        # Keyset pagination: seek past the last (created_at, _id) seen, merged into
+        # the page's own $match so the (created_at, _id) index does the seek;
+        # relevance-sorted searches fall back to offset paging
+        page_query = query
+        if request.cursor and not is_text_search:
+            after_ts, after_id = decode_job_cursor(request.cursor)
+            page_query = {
+                **query,
+                "$or": [
+                    {"created_at": {"$lt": after_ts}},
+                    {"created_at": after_ts, "_id": {"$lt": after_id}}
+                ]
+            }
+            page_stages = [{"$limit": request.limit}]
+        else:
+            # $limit right after $sort keeps it a top-k sort; the offset is then skipped
+            page_stages = [{"$limit": request.offset + request.limit}, {"$skip": request.offset}]
         
-        # Get results with pagination
-        cursor = collection.find(query)
+        pipeline = [
+            {"$match": page_query},
+            {"$sort": sort},
+            *page_stages,
+            {"$project": JOB_PREVIEW_PROJECTION}
+        ]
         
-        # Sort by relevance (text score) if text search, otherwise by date
-        if request.query:
-            cursor = cursor.sort([("score", {"$meta": "textScore"})])
+        # The page and the count run side by side as separate queries; the count
+        # alone can be answered from the indexes
+        if request.exact_count:
+            total_count_call = collection.count_documents(query)
         else:
-            cursor = cursor.sort("created_at", -1)
+            # Approximate mode: collection-wide estimate from metadata
+            total_count_call = collection.estimated_document_count()
         
-        # Apply pagination
-        cursor = cursor.skip(request.offset).limit(request.limit)
+        docs, total_count = await asyncio.gather(
+            collection.aggregate(pipeline).to_list(None),
+            total_count_call
+        )
         
-        # Execute query
-        docs = await cursor.to_list(None)
-        jobs = [JobPosting(**doc) for doc in docs]
+        jobs = [JobPosting.from_mongo(doc) for doc in docs]
+        
+        next_cursor = None
+        if not is_text_search and len(docs) == request.limit:
+            next_cursor = encode_job_cursor(docs[-1]["created_at"], docs[-1]["_id"])
         
         # Calculate search time
-        search_time = (datetime.now() - start_time).total_seconds() * 1000
+        search_time = (time.perf_counter() - start_time) * 1000.0
         
         return JobSearchResponse(
             jobs=jobs,
             total_count=total_count,
-            query_info={
-                "query": request.query,
-                "filters_applied": len([k for k, v in query.items() if v]),
-                "languages": request.languages,
-                "location": request.location
-            },
-            search_time_ms=search_time
+            query_info=QueryInfo(
+                query=request.query,
+                filters_applied=filters_applied,
+                languages=request.languages,
+                location=request.location
+            ),
+            search_time_ms=search_time,
+            next_cursor=next_cursor
         )
     
     async def get_jobs_by_source(self, source: str, limit: int = 100) -> List[JobPosting]:
         """Get jobs by source"""
         collection = await self.get_collection()
-        cursor = collection.find({"source": source}).sort("created_at", -1).limit(limit)
+        cursor = collection.find({"source": source}, JOB_PREVIEW_PROJECTION).sort("created_at", -1).limit(limit)
         docs = await cursor.to_list(None)
-        return [JobPosting(**doc) for doc in docs]
+        return [JobPosting.from_mongo(doc) for doc in docs]
+    
+    async def iter_jobs_by_source(self, source: str, limit: int = 0) -> AsyncIterator[JobPosting]:
+        """Stream jobs by source one cursor batch at a time"""
+        collection = await self.get_collection()
+        cursor = collection.find({"source": source}, JOB_PREVIEW_PROJECTION).sort("created_at", -1).limit(limit)
+        async for doc in cursor:
+            yield JobPosting.from_mongo(doc)
     
     async def get_recent_jobs(self, hours: int = 24, limit: int = 100) -> List[JobPosting]:
         """Get recent jobs"""
@@ -141,7 +265,15 @@ class JobOperations(BaseOperations):
         since = datetime.utcnow() - timedelta(hours=hours)
         cursor = collection.find({"created_at": {"$gte": since}}).sort("created_at", -1).limit(limit)
         docs = await cursor.to_list(None)
-        return [JobPosting(**doc) for doc in docs]
+        return [JobPosting.from_mongo(doc) for doc in docs]
+    
+    async def iter_recent_jobs(self, hours: int = 24, limit: int = 0) -> AsyncIterator[JobPosting]:
+        """Stream recent jobs one cursor batch at a time"""
+        collection = await self.get_collection()
+        since = datetime.utcnow() - timedelta(hours=hours)
+        cursor = collection.find({"created_at": {"$gte": since}}).sort("created_at", -1).limit(limit)
+        async for doc in cursor:
+            yield JobPosting.from_mongo(doc)
     
     async def update_job_quality_score(self, job_id: str, score: float):
         """Update job quality score"""
@@ -157,25 +289,36 @@ class JobOperations(BaseOperations):
         result = await collection.delete_one({"_id": ObjectId(job_id)})
         return result.deleted_count > 0
     
+    @ttl_cached(ttl=60)
     async def get_job_stats(self) -> Dict[str, Any]:
         """Get job collection statistics"""
         collection = await self.get_collection()
         
-        pipeline = [
-            {
-                "$group": {
-                    "_id": None,
-                    "total_jobs": {"$sum": 1},
-                    "sources": {"$addToSet": "$source"},
-                    "languages": {"$addToSet": "$language"},
-                    "avg_quality": {"$avg": "$quality_score"},
-                    "latest_job": {"$max": "$created_at"}
+        # distinct() for the low-cardinality sets instead of $addToSet arrays in one $group
+        total_jobs, sources, languages, result = await asyncio.gather(
+            collection.count_documents({}),
+            collection.distinct("source"),
+            collection.distinct("language"),
+            collection.aggregate([
+                {
+                    "$group": {
+                        "_id": None,
+                        "avg_quality": {"$avg": "$quality_score"},
+                        "latest_job": {"$max": "$created_at"}
+                    }
                 }
-            }
-        ]
+            ]).to_list(None)
+        )
         
-        result = await collection.aggregate(pipeline).to_list(None)
-        return result[0] if result else {}
+        if not result:
+            return {}
+        
+        return {
+            **result[0],
+            "total_jobs": total_jobs,
+            "sources": sources,
+            "languages": languages
+        }
 
 
 class TrainingOperations(BaseOperations):
@@ -188,14 +331,19 @@ class TrainingOperations(BaseOperations):
         """Create training example"""
         collection = await self.get_collection()
         
-        # Check for duplicates by example_id
-        existing = await collection.find_one({"example_id": example.example_id})
-        if existing:
-            return str(existing["_id"])
+        # Rely on the unique example_id index once confirmed; check first until then
+        if not await unique_index_confirmed(collection, "example_id"):
+            existing = await collection.find_one({"example_id": example.example_id}, {"_id": 1})
+            if existing:
+                return str(existing["_id"])
         
-        example_dict = example.dict(exclude={"id"})
-        result = await collection.insert_one(example_dict)
-        return str(result.inserted_id)
+        example_dict = example.to_mongo()
+        try:
+            result = await collection.insert_one(example_dict)
+            return str(result.inserted_id)
+        except DuplicateKeyError:
+            existing = await collection.find_one({"example_id": example.example_id}, {"_id": 1})
+            return str(existing["_id"])
     
     async def get_training_examples(
         self, 
@@ -214,48 +362,45 @@ class TrainingOperations(BaseOperations):
         
         cursor = collection.find(query).sort("created_at", -1).limit(limit)
         docs = await cursor.to_list(None)
-        return [TrainingExample(**doc) for doc in docs]
+        return [cached_construct(TrainingExample, doc) for doc in docs]
     
-    async def get_training_dataset(self, languages: List[str]) -> List[Dict[str, str]]:
-        """Get training dataset for model training"""
+    async def iter_training_dataset(self, languages: List[str]) -> AsyncIterator[Dict[str, str]]:
+        """Stream training pairs without holding the whole result set in memory"""
         collection = await self.get_collection()
         
         query = {"language": {"$in": languages}}
         cursor = collection.find(query, {"input_text": 1, "output_text": 1, "_id": 0})
-        docs = await cursor.to_list(None)
         
-        return [{"input": doc["input_text"], "output": doc["output_text"]} for doc in docs]
+        # Motor fetches further batches on demand; batch sizing is left to the driver
+        async for doc in cursor:
+            yield {"input": doc["input_text"], "output": doc["output_text"]}
+    
+    async def get_training_dataset(self, languages: List[str]) -> List[Dict[str, str]]:
+        """Get training dataset for model training"""
+        return [pair async for pair in self.iter_training_dataset(languages)]
     
     async def bulk_create_training_examples(self, examples: List[TrainingExample]) -> int:
         """Bulk create training examples"""
         collection = await self.get_collection()
         
-        # Remove duplicates
-        unique_examples = []
-        seen_ids = set()
-        
+        # Remove duplicates (first occurrence of each example_id wins)
+        by_id = {}
         for example in examples:
-            if example.example_id not in seen_ids:
-                unique_examples.append(example.dict(exclude={"id"}))
-                seen_ids.add(example.example_id)
+            by_id.setdefault(example.example_id, example)
+        new_ids = await self.new_keys("example_id", list(by_id))
+        unique_examples = [example.to_mongo() for example_id, example in by_id.items() if example_id in new_ids]
         
         if not unique_examples:
             return 0
         
         try:
-            result = await collection.insert_many(unique_examples, ordered=False)
+            result = await collection.insert_many(
+                unique_examples, ordered=False, bypass_document_validation=True
+            )
             return len(result.inserted_ids)
-        except (DuplicateKeyError, BulkWriteError) as e:
-            # Handle duplicates by inserting one by one
-            print(f"⚠️ Handling duplicate keys, inserting {len(unique_examples)} examples individually...")
-            inserted_count = 0
-            for example_dict in unique_examples:
-                try:
-                    await collection.insert_one(example_dict)
-                    inserted_count += 1
-                except (DuplicateKeyError, BulkWriteError):
-                    # Skip duplicates silently
-                    continue
+        except BulkWriteError as e:
+            # Unordered insert keeps going past duplicates; count what landed
+            inserted_count = e.details.get("nInserted", 0)
             print(f"✅ Successfully inserted {inserted_count} new examples (skipped duplicates)")
             return inserted_count
     
@@ -263,32 +408,85 @@ class TrainingOperations(BaseOperations):
         """Update quality scores for training examples"""
         collection = await self.get_collection()
         
-        operations = []
-        for example_id, score in scores.items():
-            operations.append({
-                "updateOne": {
-                    "filter": {"example_id": example_id},
-                    "update": {"$set": {"quality_score": score}}
-                }
-            })
+        operations = [
+            UpdateOne({"example_id": example_id}, {"$set": {"quality_score": score}})
+            for example_id, score in scores.items()
+        ]
         
         if operations:
-            await collection.bulk_write(operations)
+            await collection.bulk_write(operations, ordered=False)
 
 
 class UserOperations(BaseOperations):
     """User interaction operations"""
     
-    def __init__(self):
+    def __init__(self, flush_interval: float = 0.2, max_batch_size: int = 100):
         super().__init__("user_interactions")
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self._pending: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
     
     async def log_interaction(self, interaction: UserInteraction) -> str:
         """Log user interaction"""
         collection = await self.get_collection()
-        interaction_dict = interaction.dict(exclude={"id"})
+        interaction_dict = interaction.to_mongo()
         result = await collection.insert_one(interaction_dict)
         return str(result.inserted_id)
     
+    async def log_interaction_batch(self, interaction: UserInteraction):
+        """Buffer an interaction; a background flusher writes buffered ones with insert_many"""
+        if self._flusher is None or self._flusher.done():
+            self.start_interaction_flusher()
+        await self._pending.put(interaction.to_mongo())
+    
+    def start_interaction_flusher(self):
+        """Start the background task that drains buffered interactions"""
+        if self._pending is None:
+            self._pending = asyncio.Queue()
+        self._flusher = asyncio.create_task(self._flush_loop())
+    
+    async def stop_interaction_flusher(self):
+        """Stop the flusher and write whatever is still buffered"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        
+        if self._pending is not None:
+            batch = []
+            while not self._pending.empty():
+                batch.append(self._pending.get_nowait())
+            await self._insert_interactions(batch)
+    
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Block for the first interaction, then coalesce for up to flush_interval
+            batch = [await self._pending.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._pending.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._insert_interactions(batch)
+    
+    async def _insert_interactions(self, batch: List[Dict[str, Any]]):
+        if not batch:
+            return
+        try:
+            collection = await self.get_collection()
+            await collection.insert_many(batch, ordered=False)
+        except Exception as e:
+            print(f"⚠️ Failed to flush {len(batch)} interactions: {e}")
+    
     async def get_user_interactions(
         self, 
         user_id: str, 
@@ -304,36 +502,41 @@ class UserOperations(BaseOperations):
         
         cursor = collection.find(query).sort("timestamp", -1).limit(limit)
         docs = await cursor.to_list(None)
-        return [UserInteraction(**doc) for doc in docs]
+        return [cached_construct(UserInteraction, doc) for doc in docs]
     
     async def get_interaction_stats(self, days: int = 30) -> Dict[str, Any]:
         """Get interaction statistics"""
         collection = await self.get_collection()
         since = datetime.utcnow() - timedelta(days=days)
-        
-        pipeline = [
-            {"$match": {"timestamp": {"$gte": since}}},
-            {
-                "$group": {
-                    "_id": None,
-                    "total_interactions": {"$sum": 1},
-                    "unique_users": {"$addToSet": "$user_id"},
-                    "unique_sessions": {"$addToSet": "$session_id"},
-                    "avg_response_time": {"$avg": "$response_time_ms"},
-                    "languages": {"$addToSet": "$language"}
+        match = {"$match": {"timestamp": {"$gte": since}}}
+        
+        def count_unique(field: str, name: str):
+            # $group per key then $count streams instead of building one big $addToSet array
+            return collection.aggregate([match, {"$group": {"_id": f"${field}"}}, {"$count": name}]).to_list(None)
+        
+        result, users, sessions, languages = await asyncio.gather(
+            collection.aggregate([
+                match,
+                {
+                    "$group": {
+                        "_id": None,
+                        "total_interactions": {"$sum": 1},
+                        "avg_response_time": {"$avg": "$response_time_ms"}
+                    }
                 }
-            }
-        ]
-        
-        result = await collection.aggregate(pipeline).to_list(None)
-        stats = result[0] if result else {}
+            ]).to_list(None),
+            count_unique("user_id", "unique_users_count"),
+            count_unique("session_id", "unique_sessions_count"),
+            collection.distinct("language", {"timestamp": {"$gte": since}})
+        )
         
-        if "unique_users" in stats:
-            stats["unique_users_count"] = len(stats["unique_users"])
-            stats["unique_sessions_count"] = len(stats["unique_sessions"])
-            del stats["unique_users"]
-            del stats["unique_sessions"]
+        if not result:
+            return {}
         
+        stats = result[0]
+        stats["unique_users_count"] = users[0]["unique_users_count"] if users else 0
+        stats["unique_sessions_count"] = sessions[0]["unique_sessions_count"] if sessions else 0
+        stats["languages"] = languages
         return stats
 
 
@@ -353,7 +556,7 @@ class ModelOperations(BaseOperations):
             {"$set": {"is_active": False}}
         )
         
-        model_dict = model_info.dict(exclude={"id"})
+        model_dict = model_info.to_mongo()
         result = await collection.insert_one(model_dict)
         return str(result.inserted_id)
     
@@ -361,14 +564,14 @@ class ModelOperations(BaseOperations):
         """Get active model by name"""
         collection = await self.get_collection()
         doc = await collection.find_one({"name": name, "is_active": True})
-        return ModelInfo(**doc) if doc else None
+        return cached_construct(ModelInfo, doc) if doc else None
     
     async def get_model_versions(self, name: str) -> List[ModelInfo]:
         """Get all versions of a model"""
         collection = await self.get_collection()
         cursor = collection.find({"name": name}).sort("created_at", -1)
         docs = await cursor.to_list(None)
-        return [ModelInfo(**doc) for doc in docs]
+        return [cached_construct(ModelInfo, doc) for doc in docs]
     
     async def update_model_status(self, model_id: str, status: str):
         """Update model status"""
@@ -396,7 +599,7 @@ class ScrapingOperations(BaseOperations):
     async def start_scraping_session(self, session: ScrapingSession) -> str:
         """Start new scraping session"""
         collection = await self.get_collection()
-        session_dict = session.dict(exclude={"id"})
+        session_dict = session.to_mongo()
         result = await collection.insert_one(session_dict)
         return str(result.inserted_id)
     
@@ -437,12 +640,16 @@ class ScrapingOperations(BaseOperations):
             {"$set": updates}
         )
     
-    async def get_recent_scraping_sessions(self, limit: int = 20) -> List[ScrapingSession]:
-        """Get recent scraping sessions"""
+    async def get_recent_scraping_sessions(
+        self, 
+        limit: int = 20,
+        projection: Optional[Dict[str, int]] = None
+    ) -> List[ScrapingSession]:
+        """Get recent scraping sessions, optionally with only the projected fields"""
         collection = await self.get_collection()
-        cursor = collection.find().sort("started_at", -1).limit(limit)
+        cursor = collection.find({}, projection).sort("started_at", -1).limit(limit)
         docs = await cursor.to_list(None)
-        return [ScrapingSession(**doc) for doc in docs]
+        return [cached_construct(ScrapingSession, doc) for doc in docs]
 
 
 class ChatOperations(BaseOperations):
@@ -451,62 +658,138 @@ class ChatOperations(BaseOperations):
     def __init__(self):
         super().__init__("chat_histories")
     
+    @staticmethod
+    def _normalize_messages(raw_messages: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int, int]:
+        """Shape frontend message dicts like stored ChatMessages in one pass.
+        
+        Returns the documents plus their jobs-found and job-search counts.
+        """
+        docs = []
+        jobs_found = 0
+        job_searches = 0
+        now = None
+        
+        for msg_data in raw_messages:
+            timestamp = msg_data.get("timestamp")
+            if isinstance(timestamp, str):
+                timestamp = parse_iso_timestamp(timestamp)
+            elif timestamp is None:
+                timestamp = now = now or datetime.utcnow()
+            
+            jobs = msg_data.get("jobs") or []
+            sender = msg_data.get("sender", "")
+            if jobs:
+                jobs_found += len(jobs)
+                if sender == "bot":
+                    job_searches += 1
+            
+            docs.append({
+                "message_id": message_key(msg_data),
+                "content": msg_data.get("content", ""),
+                "sender": sender,
+                "timestamp": timestamp,
+                "jobs": jobs,
+                "total_jobs": msg_data.get("total_jobs", msg_data.get("totalJobs")),
+                "response_time_ms": msg_data.get("response_time_ms")
+            })
+        
+        return docs, jobs_found, job_searches
+    
     async def save_chat(self, chat_data: Dict[str, Any]) -> str:
         """Save or update chat history"""
-        from database.models import ChatHistory, ChatMessage
-        
-        collection = await self.get_collection()
-        
-        # Convert messages to ChatMessage objects
-        messages = []
-        for msg_data in chat_data.get("messages", []):
-            if isinstance(msg_data, dict):
-                message = ChatMessage(
-                    message_id=msg_data.get("id", msg_data.get("message_id", "")),
-                    content=msg_data.get("content", ""),
-                    sender=msg_data.get("sender", ""),
-                    timestamp=datetime.fromisoformat(msg_data["timestamp"].replace('Z', '+00:00')) if isinstance(msg_data.get("timestamp"), str) else msg_data.get("timestamp", datetime.utcnow()),
-                    jobs=msg_data.get("jobs", []),
-                    total_jobs=msg_data.get("total_jobs", msg_data.get("totalJobs")),
-                    response_time_ms=msg_data.get("response_time_ms")
+        collection = await self.get_collection()
+        
+        raw_messages = [m for m in chat_data.get("messages", []) if isinstance(m, dict)]
+        
+        # The frontend resends the whole conversation; when it only grew,
+        # push the new tail instead of rewriting the stored array
+        existing = await collection.find_one(
+            {"chat_id": chat_data["id"]},
+            {"last_message_seq": 1, "messages": {"$slice": -1}}
+        )
+        prev_seq = existing.get("last_message_seq") if existing else None
+        
+        if prev_seq is not None and prev_seq <= len(raw_messages):
+            tail = existing.get("messages") or []
+            is_append = (
+                tail[-1].get("message_id") == message_key(raw_messages[prev_seq - 1])
+                if prev_seq and tail else prev_seq == 0
+            )
+            if is_append:
+                # Only the new tail is parsed and shaped
+                new_messages, jobs_found, job_searches = self._normalize_messages(raw_messages[prev_seq:])
+                now = datetime.utcnow()
+                
+                # Guarded on last_message_seq so a concurrent save falls through to the full replace
+                result = await collection.update_one(
+                    {"_id": existing["_id"], "last_message_seq": prev_seq},
+                    {
+                        "$push": {"messages": {"$each": new_messages}},
+                        "$inc": {
+                            "message_count": len(new_messages),
+                            "jobs_found_total": jobs_found,
+                            "job_searches_count": job_searches
+                        },
+                        "$set": {
+                            "title": chat_data.get("title", "New Chat"),
+                            "updated_at": now,
+                            "last_activity": now,
+                            "last_message_seq": len(raw_messages)
+                        }
+                    }
                 )
-                messages.append(message)
-        
-        # Check if chat already exists
-        existing_chat = await collection.find_one({"chat_id": chat_data["id"]})
-        
-        if existing_chat:
-            # Update existing chat
-            updates = {
-                "title": chat_data.get("title", "New Chat"),
-                "messages": [msg.dict() for msg in messages],
-                "message_count": len(messages),
-                "updated_at": datetime.utcnow(),
-                "last_activity": datetime.utcnow(),
-                "job_searches_count": len([m for m in messages if m.sender == "bot" and m.jobs]),
-                "jobs_found_total": sum(len(m.jobs) for m in messages if m.jobs)
+                if result.matched_count:
+                    return str(existing["_id"])
+        
+        messages, _, _ = self._normalize_messages(raw_messages)
+        return await self._replace_chat(collection, chat_data, messages)
+    
+    async def _replace_chat(self, collection, chat_data: Dict[str, Any], messages: List[Dict[str, Any]]) -> str:
+        """Upsert the chat with its full message list (new chats, edits, reorders)"""
+        jobs_in_message = {"$size": {"$ifNull": ["$$this.jobs", []]}}
+        
+        # Pipeline update: MongoDB derives the aggregates from the stored
+        # messages, and the $ifNull defaults only apply when the upsert inserts
+        pipeline = [
+            {
+                "$set": {
+                    "title": {"$literal": chat_data.get("title", "New Chat")},
+                    "messages": {"$literal": messages},
+                    "user_id": {"$ifNull": ["$user_id", {"$literal": chat_data.get("userId", "unknown")}]},
+                    "language": {"$ifNull": ["$language", "english"]},
+                    "tags": {"$ifNull": ["$tags", []]},
+                    "is_active": {"$ifNull": ["$is_active", True]},
+                    "is_archived": {"$ifNull": ["$is_archived", False]},
+                    "created_at": {"$ifNull": ["$created_at", "$$NOW"]},
+                    "updated_at": "$$NOW",
+                    "last_activity": "$$NOW"
+                }
+            },
+            {
+                "$set": {
+                    "message_count": {"$size": "$messages"},
+                    "last_message_seq": {"$size": "$messages"},
+                    "jobs_found_total": {"$sum": {"$map": {"input": "$messages", "in": jobs_in_message}}},
+                    "job_searches_count": {
+                        "$size": {
+                            "$filter": {
+                                "input": "$messages",
+                                "cond": {"$and": [{"$eq": ["$$this.sender", "bot"]}, {"$gt": [jobs_in_message, 0]}]}
+                            }
+                        }
+                    }
+                }
             }
-            
-            await collection.update_one(
-                {"chat_id": chat_data["id"]},
-                {"$set": updates}
-            )
-            return str(existing_chat["_id"])
-        else:
-            # Create new chat
-            chat_history = ChatHistory(
-                chat_id=chat_data["id"],
-                user_id=chat_data.get("userId", "unknown"),
-                title=chat_data.get("title", "New Chat"),
-                messages=messages,
-                message_count=len(messages),
-                job_searches_count=len([m for m in messages if m.sender == "bot" and m.jobs]),
-                jobs_found_total=sum(len(m.jobs) for m in messages if m.jobs)
-            )
-            
-            chat_dict = chat_history.dict(exclude={"id"})
-            result = await collection.insert_one(chat_dict)
-            return str(result.inserted_id)
+        ]
+        
+        chat = await collection.find_one_and_update(
+            {"chat_id": chat_data["id"]},
+            pipeline,
+            upsert=True,
+            projection={"_id": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        return str(chat["_id"])
     
     async def get_user_chats(self, user_id: str, limit: int = 50, include_archived: bool = False) -> List[Dict[str, Any]]:
         """Get user's chat history"""
@@ -516,33 +799,29 @@ class ChatOperations(BaseOperations):
         if not include_archived:
             query["is_archived"] = {"$ne": True}
         
-        # Return simplified chat data for the UI
-        projection = {
-            "chat_id": 1,
-            "title": 1,
-            "message_count": 1,
-            "last_activity": 1,
-            "created_at": 1,
-            "job_searches_count": 1,
-            "jobs_found_total": 1,
-            "messages": {"$slice": 1}  # Only get first message for preview
-        }
-        
-        cursor = collection.find(query, projection).sort("last_activity", -1).limit(limit)
-        docs = await cursor.to_list(None)
-        
-        # Format for frontend
-        chats = []
-        for doc in docs:
-            chat = {
-                "id": doc["chat_id"],
-                "title": doc["title"],
-                "timestamp": doc["last_activity"].isoformat(),
-                "messages": doc.get("messages", [])
+        # Shape the sidebar payload server-side: only the first message's text and
+        # sender are kept for the preview, never its (potentially large) jobs array
+        pipeline = [
+            {"$match": query},
+            {"$sort": {"last_activity": -1}},
+            {"$limit": limit},
+            {
+                "$project": {
+                    "_id": 0,
+                    "id": "$chat_id",
+                    "title": 1,
+                    "timestamp": {"$dateToString": {"date": "$last_activity"}},
+                    "messages": {
+                        "$map": {
+                            "input": {"$slice": [{"$ifNull": ["$messages", []]}, 1]},
+                            "in": {"content": "$$this.content", "sender": "$$this.sender"}
+                        }
+                    }
+                }
             }
-            chats.append(chat)
+        ]
         
-        return chats
+        return await collection.aggregate(pipeline).to_list(None)
     
     async def get_chat_by_id(self, chat_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """Get specific chat by ID"""
@@ -596,15 +875,6 @@ class ChatOperations(BaseOperations):
         """Search user's chats by content"""
         collection = await self.get_collection()
         
-        # Text search in title and message content
-        search_query = {
-            "user_id": user_id,
-            "$or": [
-                {"title": {"$regex": query, "$options": "i"}},
-                {"messages.content": {"$regex": query, "$options": "i"}}
-            ]
-        }
-        
         projection = {
             "chat_id": 1,
             "title": 1,
@@ -612,9 +882,21 @@ class ChatOperations(BaseOperations):
             "message_count": 1
         }
         
-        cursor = collection.find(search_query, projection).sort("last_activity", -1).limit(limit)
+        # Text search in title and message content via chat_text_idx
+        cursor = collection.find(
+            {"user_id": user_id, "$text": {"$search": query}},
+            {**projection, "score": {"$meta": "textScore"}}
+        ).sort([("score", {"$meta": "textScore"})]).limit(limit)
         docs = await cursor.to_list(None)
         
+        if not docs:
+            # Fall back to an anchored title prefix match (partial words)
+            cursor = collection.find(
+                {"user_id": user_id, "title": {"$regex": f"^{re.escape(query)}", "$options": "i"}},
+                projection
+            ).sort("last_activity", -1).limit(limit)
+            docs = await cursor.to_list(None)
+        
         return [
             {
                 "id": doc["chat_id"],
@@ -625,6 +907,7 @@ class ChatOperations(BaseOperations):
             for doc in docs
         ]
     
+    @ttl_cached(ttl=60)
     async def get_chat_stats(self, user_id: Optional[str] = None) -> Dict[str, Any]:
         """Get chat statistics"""
         collection = await self.get_collection()
@@ -634,29 +917,45 @@ class ChatOperations(BaseOperations):
         if user_id:
             pipeline.append({"$match": {"user_id": user_id}})
         
-        pipeline.extend([
-            {
-                "$group": {
-                    "_id": None,
-                    "total_chats": {"$sum": 1},
-                    "total_messages": {"$sum": "$message_count"},
-                    "total_job_searches": {"$sum": "$job_searches_count"},
-                    "total_jobs_found": {"$sum": "$jobs_found_total"},
-                    "avg_messages_per_chat": {"$avg": "$message_count"},
-                    "latest_activity": {"$max": "$last_activity"},
-                    "active_chats": {
-                        "$sum": {
-                            "$cond": [{"$ne": ["$is_archived", True]}, 1, 0]
+        # One round trip for the whole dashboard: totals, per-status counts and recent chats
+        pipeline.append({
+            "$facet": {
+                "totals": [
+                    {
+                        "$group": {
+                            "_id": None,
+                            "total_chats": {"$sum": 1},
+                            "total_messages": {"$sum": "$message_count"},
+                            "total_job_searches": {"$sum": "$job_searches_count"},
+                            "total_jobs_found": {"$sum": "$jobs_found_total"},
+                            "avg_messages_per_chat": {"$avg": "$message_count"},
+                            "latest_activity": {"$max": "$last_activity"}
                         }
                     }
-                }
+                ],
+                "active": [{"$match": {"is_archived": {"$ne": True}}}, {"$count": "n"}],
+                "archived": [{"$match": {"is_archived": True}}, {"$count": "n"}],
+                "recent": [
+                    {"$sort": {"last_activity": -1}},
+                    {"$limit": 5},
+                    {"$project": {"_id": 0, "chat_id": 1, "title": 1, "last_activity": 1}}
+                ]
             }
-        ])
+        })
         
         result = await collection.aggregate(pipeline).to_list(None)
-        return result[0] if result else {}
+        facets = result[0] if result else {}
+        if not facets.get("totals"):
+            return {}
+        
+        stats = facets["totals"][0]
+        stats["active_chats"] = facets["active"][0]["n"] if facets["active"] else 0
+        stats["archived_chats"] = facets["archived"][0]["n"] if facets["archived"] else 0
+        stats["recent_chats"] = facets["recent"]
+        return stats
 
 
+@ttl_cached(ttl=60, key=lambda: "database_statistics")
 async def get_database_statistics() -> DatabaseStats:
     """Get comprehensive database statistics"""
     from database.models import DatabaseStats
@@ -669,23 +968,33 @@ async def get_database_statistics() -> DatabaseStats:
     scraping_ops = ScrapingOperations()
     chat_ops = ChatOperations()
     
-    # Get counts from each collection
-    total_jobs = await job_ops.count_documents()
-    total_training_examples = await training_ops.count_documents()
-    total_interactions = await user_ops.count_documents()
-    total_models = await model_ops.count_documents()
-    total_scraping_sessions = await scraping_ops.count_documents()
-    total_chat_histories = await chat_ops.count_documents()
-    
-    # Get additional stats
-    job_stats = await job_ops.get_job_stats()
-    chat_stats = await chat_ops.get_chat_stats()
+    # The queries are independent, so issue them concurrently
+    (
+        total_jobs,
+        total_training_examples,
+        total_interactions,
+        total_models,
+        total_scraping_sessions,
+        total_chat_histories,
+        job_stats,
+        chat_stats,
+        recent_sessions,
+    ) = await asyncio.gather(
+        job_ops.count_documents(),
+        training_ops.count_documents(),
+        user_ops.count_documents(),
+        model_ops.count_documents(),
+        scraping_ops.count_documents(),
+        chat_ops.count_documents(),
+        job_ops.get_job_stats(),
+        chat_ops.get_chat_stats(),
+        scraping_ops.get_recent_scraping_sessions(limit=1, projection={"started_at": 1}),
+    )
     
     # Calculate total chat messages
     total_chat_messages = chat_stats.get("total_messages", 0)
     
     # Get recent scraping session
-    recent_sessions = await scraping_ops.get_recent_scraping_sessions(limit=1)
     last_scraping_session = recent_sessions[0].started_at if recent_sessions else None
     
     return DatabaseStats(
@@ -1,11 +1,61 @@
 import re
-from typing import List, Dict, Any
-from fuzzywuzzy import fuzz
+import string
+from typing import List, Dict, Any, Optional, Tuple
+from difflib import SequenceMatcher
+from functools import lru_cache
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import linear_kernel
 import json
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; fall back to one compiled regex
+    ahocorasick = None
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # rapidfuzz is optional; fall back to stdlib difflib
+    fuzz = process = None
+
+
+# Punctuation to whitespace for word tokenization (keeps the + and # of c++ / c#)
+WORD_TABLE = str.maketrans({c: " " for c in string.punctuation if c not in "+#"})
+
+# Weights of the title / location / skills / experience sub-scores (sum to 1)
+SCORE_WEIGHTS = np.array([0.4, 0.2, 0.25, 0.15])
+
+
+# Titles and locations repeat heavily across a catalog ('Senior Software Engineer',
+# 'Tbilisi'), so identical (text, query) pairs are scored once
+@lru_cache(maxsize=4096)
+def fuzzy_similarity(text: str, query: str) -> float:
+    """0-1 fuzzy similarity: rapidfuzz partial_ratio, or difflib's ratio without it"""
+    if fuzz is not None:
+        return fuzz.partial_ratio(text, query) / 100.0
+    return SequenceMatcher(None, text, query).ratio()
+
+
+def batch_fuzzy_similarity(texts: List[str], query: str) -> np.ndarray:
+    """fuzzy_similarity of every text against one query, scoring each distinct text once"""
+    unique_texts = list(dict.fromkeys(texts))
+    
+    if process is not None:
+        unique_scores = process.cdist(unique_texts, [query], scorer=fuzz.partial_ratio, workers=-1)[:, 0] / 100.0
+    else:
+        unique_scores = [fuzzy_similarity(text, query) for text in unique_texts]
+    
+    if len(unique_texts) == len(texts):
+        return np.asarray(unique_scores)
+    score_by_text = dict(zip(unique_texts, unique_scores))
+    return np.array([score_by_text[text] for text in texts])
+
 
 class JobMatcher:
-    def __init__(self):
+    def __init__(self, tfidf_min_jobs: int = 500):
+        # Catalogs at least this large are narrowed by TF-IDF cosine before fuzzy title scoring
+        self.tfidf_min_jobs = tfidf_min_jobs
+        
         self.skill_keywords = {
             'programming': ['python', 'javascript', 'java', 'c++', 'c#', 'go', 'rust', 'swift', 'kotlin'],
             'web': ['react', 'angular', 'vue', 'html', 'css', 'nodejs', 'express', 'django', 'flask'],
@@ -20,49 +70,275 @@ class JobMatcher:
             'mid': ['mid', 'intermediate', '2-5 years', '3-7 years'],
             'senior': ['senior', 'lead', 'principal', '5+ years', '7+ years', 'architect']
         }
+        
+        # Skills as bits: a job's detected skills become one int mask, and
+        # "any related skill present" is a single AND against a category mask
+        all_skills = sorted({skill for skills_list in self.skill_keywords.values() for skill in skills_list})
+        self.skill_bits = {skill: 1 << i for i, skill in enumerate(all_skills)}
+        
+        # Reverse index: skill -> masks of the categories it belongs to (a skill such
+        # as 'swift' sits in several, and each category earns partial credit)
+        self.skill_to_related = {}
+        for skills_list in self.skill_keywords.values():
+            category_mask = 0
+            for skill in skills_list:
+                category_mask |= self.skill_bits[skill]
+            for skill in skills_list:
+                self.skill_to_related.setdefault(skill, []).append(category_mask)
+        
+        self.job_type_keywords = {
+            'remote': ['remote', 'work from home'],
+            'contract': ['contract', 'contractor'],
+            'part-time': ['part-time', 'part time'],
+        }
+        
+        vocabulary = {
+            keyword
+            for groups in (self.skill_keywords, self.experience_levels, self.job_type_keywords)
+            for keywords in groups.values()
+            for keyword in keywords
+        }
+        
+        # One automaton over every known keyword: a single pass over the job
+        # text reports all skill / experience / job-type hits at once
+        self.keyword_automaton = None
+        if ahocorasick is not None:
+            self.keyword_automaton = ahocorasick.Automaton()
+            for keyword in vocabulary:
+                self.keyword_automaton.add_word(keyword, keyword)
+            self.keyword_automaton.make_automaton()
+        
+        # Regex fallback: a zero-width lookahead alternation (longest first) reports the
+        # longest keyword starting at each position; every keyword that is a prefix of it
+        # occurs there too. No \b, to keep the substring semantics the scores rely on.
+        ordered = sorted(vocabulary, key=len, reverse=True)
+        self.keyword_re = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+        self.keyword_prefixes = {
+            keyword: frozenset(k for k in vocabulary if keyword.startswith(k))
+            for keyword in vocabulary
+        }
+    
+    def job_text(self, job: Dict) -> str:
+        """Lowercased title + description that the keyword checks search"""
+        # str.lower() already takes CPython's ASCII fast path, and unlike an ASCII-only
+        # bytes.translate it keeps Georgian / Russian postings intact
+        return f"{job.get('title', '')} {job.get('description', '')}".lower()
+    
+    def keyword_hits(self, job_text: str) -> set:
+        """Known keywords occurring anywhere in the (lowercased) job text"""
+        if self.keyword_automaton is not None:
+            return {keyword for _, keyword in self.keyword_automaton.iter(job_text)}
+        
+        hits = set()
+        for longest in set(self.keyword_re.findall(job_text)):
+            hits |= self.keyword_prefixes[longest]
+        return hits
     
-    def match_jobs(self, jobs: List[Dict], requirements: Dict[str, Any]) -> List[Dict]:
+    def scan_text(self, job_text: str) -> Tuple[set, Optional[str]]:
+        """One keyword pass over the job text: the hits plus the experience level they imply"""
+        hits = self.keyword_hits(job_text)
+        
+        # First level (then keyword) in declaration order wins
+        for level, keywords in self.experience_levels.items():
+            if not hits.isdisjoint(keywords):
+                return hits, level
+        return hits, None
+    
+    def match_jobs(
+        self,
+        jobs: List[Dict],
+        requirements: Dict[str, Any],
+        top_k: Optional[int] = None,
+        in_place: bool = False
+    ) -> List[Dict]:
+        """Score, filter and rank jobs against the requirements.
+        
+        Matched jobs get `match_score` / `match_reasons` keys. With `in_place`
+        those are set on the caller's dicts instead of on shallow copies.
+        """
+        if not jobs:
+            return []
+        
+        # Lowercased once per job (parallel list, so the input dicts are left untouched)
+        job_texts = [self.job_text(job) for job in jobs]
+        
+        # Retrieval before ranking: drop jobs that contradict the hard criteria (job
+        # type) so the fuzzy scoring below only runs on the survivors
+        survivors = [i for i, text in enumerate(job_texts) if self.meets_criteria(jobs[i], requirements, text)]
+        if len(survivors) < len(jobs):
+            jobs = [jobs[i] for i in survivors]
+            job_texts = [job_texts[i] for i in survivors]
+        if not jobs:
+            return []
+        
+        req_norm = self.normalize_requirements(requirements)
+        title_fuzzy, location_fuzzy = self.batch_fuzzy_scores(jobs, requirements, req_norm, job_texts)
+        
+        # Sub-scores are written straight into a preallocated (N, 4) array; the
+        # weighting, threshold and ordering then run as array operations
+        sub_scores = np.empty((len(jobs), len(SCORE_WEIGHTS)))
+        breakdowns = []
+        for i, job in enumerate(jobs):
+            _, breakdown = self.score_breakdown(
+                job, requirements, title_fuzzy[i], location_fuzzy[i], job_texts[i], req_norm
+            )
+            sub_scores[i] = (breakdown['title'], breakdown['location'], breakdown['skills'], breakdown['experience'])
+            breakdowns.append(breakdown)
+        
+        scores = sub_scores @ SCORE_WEIGHTS
+        
+        kept = np.flatnonzero(scores > 0.3)  # Minimum threshold
+        if top_k is not None and top_k < kept.size:
+            # Partition only to find the k-th score; ties at it are filled in input
+            # order, and the masks keep kept sorted for the stable sort below
+            kept_scores = scores[kept]
+            cutoff = -np.partition(-kept_scores, top_k - 1)[top_k - 1]
+            above = kept[kept_scores > cutoff]
+            tied = kept[kept_scores == cutoff][:top_k - above.size]
+            kept = np.sort(np.concatenate([above, tied]))
+        # Stable, so equal scores keep their input order as the list sort did
+        order = kept[np.argsort(-scores[kept], kind="stable")]
+        
         matched_jobs = []
+        for i in order:
+            job = jobs[i]
+            matched = job if in_place else job.copy()
+            matched['match_score'] = float(scores[i])
+            # Reasons are formatted from the sub-scores already computed above
+            matched['match_reasons'] = self.get_match_reasons(job, requirements, sub_scores=breakdowns[i])
+            matched_jobs.append(matched)
         
-        for job in jobs:
-            score = self.calculate_match_score(job, requirements)
-            if score > 0.3:  # Minimum threshold
-                job_copy = job.copy()
-                job_copy['match_score'] = score
-                job_copy['match_reasons'] = self.get_match_reasons(job, requirements)
-                matched_jobs.append(job_copy)
-        
-        matched_jobs.sort(key=lambda x: x['match_score'], reverse=True)
         return matched_jobs
     
-    def calculate_match_score(self, job: Dict, requirements: Dict[str, Any]) -> float:
+    def normalize_requirements(self, requirements: Dict[str, Any]) -> Dict[str, Any]:
+        """Lowercase the requirement fields once so per-job scoring can reuse them"""
+        required_keywords = requirements.get('keywords', '')
+        keywords, keywords_str = self.keywords_text(required_keywords) if required_keywords else ([], '')
+        skills = requirements.get('skills') or []
+        
+        keyword_tokens, keyword_phrases = self.keyword_terms(keywords)
+        
+        return {
+            'keywords': keywords,
+            'keywords_str': keywords_str,
+            'keyword_tokens': keyword_tokens,
+            'keyword_phrases': keyword_phrases,
+            'skills_lower': [skill.lower() for skill in skills],
+            'location_lower': (requirements.get('location') or '').lower(),
+        }
+    
+    def batch_fuzzy_scores(
+        self,
+        jobs: List[Dict],
+        requirements: Dict[str, Any],
+        req_norm: Optional[Dict[str, Any]] = None,
+        job_texts: Optional[List[str]] = None
+    ):
+        """Fuzzy title/location scores for all jobs, each in one batched call"""
+        if req_norm is None:
+            req_norm = self.normalize_requirements(requirements)
+        
+        title_fuzzy = [None] * len(jobs)
+        location_fuzzy = [None] * len(jobs)
+        
+        tfidf_scores = None
+        if requirements.get('keywords', '') and len(jobs) >= self.tfidf_min_jobs:
+            if job_texts is None:
+                job_texts = [self.job_text(job) for job in jobs]
+            tfidf_scores = self.tfidf_similarity(job_texts, req_norm)
+        
+        if requirements.get('keywords', ''):
+            titles = [(job.get('title') or '').lower() for job in jobs]
+            if tfidf_scores is None:
+                title_fuzzy = batch_fuzzy_similarity(titles, req_norm['keywords_str'])
+            else:
+                # TF-IDF only picks the candidates (jobs sharing a term with the query);
+                # they keep the same fuzzy title score as smaller catalogs
+                title_fuzzy = np.zeros(len(jobs))
+                candidates = np.flatnonzero(tfidf_scores > 0)
+                if candidates.size:
+                    title_fuzzy[candidates] = batch_fuzzy_similarity(
+                        [titles[i] for i in candidates], req_norm['keywords_str']
+                    )
+        
+        location_lower = req_norm['location_lower']
+        if location_lower and 'remote' not in location_lower:
+            locations = [(job.get('location') or '').lower() for job in jobs]
+            location_fuzzy = batch_fuzzy_similarity(locations, location_lower)
+        
+        return title_fuzzy, location_fuzzy
+    
+    def tfidf_similarity(self, job_texts: List[str], req_norm: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Cosine similarity of each job text to the keywords + skills, as one sparse product"""
+        query = " ".join([req_norm['keywords_str'], *req_norm['skills_lower']])
+        vectorizer = TfidfVectorizer(ngram_range=(1, 2))
+        try:
+            job_matrix = vectorizer.fit_transform(job_texts)
+        except ValueError:
+            # Empty vocabulary (e.g. all-blank texts); let the fuzzy path handle it
+            return None
+        
+        # Rows are L2-normalised, so the linear kernel is the cosine similarity
+        return linear_kernel(job_matrix, vectorizer.transform([query])).ravel()
+    
+    def calculate_match_score(
+        self,
+        job: Dict,
+        requirements: Dict[str, Any],
+        title_fuzzy: Optional[float] = None,
+        location_fuzzy: Optional[float] = None,
+        job_text: Optional[str] = None,
+        req_norm: Optional[Dict[str, Any]] = None
+    ) -> float:
+        return self.score_breakdown(job, requirements, title_fuzzy, location_fuzzy, job_text, req_norm)[0]
+    
+    def score_breakdown(
+        self,
+        job: Dict,
+        requirements: Dict[str, Any],
+        title_fuzzy: Optional[float] = None,
+        location_fuzzy: Optional[float] = None,
+        job_text: Optional[str] = None,
+        req_norm: Optional[Dict[str, Any]] = None
+    ) -> Tuple[float, Dict[str, Any]]:
+        """Weighted match score plus the sub-scores it was built from"""
+        if job_text is None:
+            job_text = self.job_text(job)
+        if req_norm is None:
+            req_norm = self.normalize_requirements(requirements)
+        
         score = 0.0
         total_weight = 0.0
         
-        title_score = self.match_title_keywords(job.get('title', ''), requirements.get('keywords', ''))
+        title_score = self.match_title_keywords(job.get('title', ''), requirements.get('keywords', ''), title_fuzzy, req_norm)
         score += title_score * 0.4
         total_weight += 0.4
         
-        location_score = self.match_location(job.get('location', ''), requirements.get('location', ''))
+        location_score = self.match_location(job.get('location', ''), requirements.get('location', ''), location_fuzzy, req_norm)
         score += location_score * 0.2
         total_weight += 0.2
         
-        skills_score = self.match_skills(job, requirements.get('skills', []))
+        hits, detected_level = self.scan_text(job_text)
+        
+        skills_score, skills_matched = self.skill_match_details(job, requirements.get('skills', []), job_text, req_norm, hits)
         score += skills_score * 0.25
         total_weight += 0.25
         
-        exp_score = self.match_experience_level(job, requirements.get('experience_level', 'any'))
+        exp_score = self.match_experience_level(job, requirements.get('experience_level', 'any'), job_text, detected_level)
         score += exp_score * 0.15
         total_weight += 0.15
         
-        return score / total_weight if total_weight > 0 else 0.0
+        sub_scores = {
+            'title': title_score,
+            'location': location_score,
+            'skills': skills_score,
+            'skills_matched': skills_matched,
+            'experience': exp_score,
+        }
+        return (score / total_weight if total_weight > 0 else 0.0), sub_scores
     
-    def match_title_keywords(self, job_title: str, required_keywords) -> float:
-        if not required_keywords or not job_title:
-            return 0.5
-        
-        job_title_lower = job_title.lower()
-        
+    def keywords_text(self, required_keywords):
+        """Lowercased keyword list and joined keyword string"""
         # Handle both string and list inputs
         if isinstance(required_keywords, list):
             keywords = [kw.lower() for kw in required_keywords]
@@ -70,22 +346,67 @@ class JobMatcher:
         else:
             keywords_str = str(required_keywords).lower()
             keywords = keywords_str.split()
-        
-        matches = 0
+        return keywords, keywords_str
+    
+    def keyword_terms(self, keywords: List[str]) -> Tuple[frozenset, Tuple[str, ...]]:
+        """Single-word keywords as a token set; multi-word ones kept as phrases"""
+        tokens = set()
+        phrases = []
         for keyword in keywords:
-            if keyword in job_title_lower:
-                matches += 1
+            words = keyword.translate(WORD_TABLE).split()
+            if len(words) == 1:
+                tokens.add(words[0])
+            elif words:
+                phrases.append(" ".join(words))
+        return frozenset(tokens), tuple(phrases)
+    
+    def match_title_keywords(
+        self,
+        job_title: str,
+        required_keywords,
+        fuzzy_score: Optional[float] = None,
+        req_norm: Optional[Dict[str, Any]] = None
+    ) -> float:
+        if not required_keywords or not job_title:
+            return 0.5
         
-        if keywords:
-            direct_score = matches / len(keywords)
+        job_title_lower = job_title.lower()
+        if req_norm is not None:
+            keywords, keywords_str = req_norm['keywords'], req_norm['keywords_str']
+            keyword_tokens, keyword_phrases = req_norm['keyword_tokens'], req_norm['keyword_phrases']
+        else:
+            keywords, keywords_str = self.keywords_text(required_keywords)
+            keyword_tokens, keyword_phrases = self.keyword_terms(keywords)
+        
+        # Whole-word matches: 'java' no longer counts inside 'javascript'
+        title_words = job_title_lower.translate(WORD_TABLE).split()
+        matches = len(keyword_tokens.intersection(title_words))
+        if keyword_phrases:
+            title_text = " ".join(title_words)
+            matches += sum(1 for phrase in keyword_phrases if phrase in title_text)
+        
+        keyword_count = len(keyword_tokens) + len(keyword_phrases)
+        if keyword_count:
+            direct_score = matches / keyword_count
         else:
             direct_score = 0.0
         
-        fuzzy_score = fuzz.partial_ratio(job_title_lower, keywords_str) / 100.0
+        # Fuzzy is capped at 0.8, so a direct score at or above that always wins
+        if direct_score >= 0.8:
+            return direct_score
+        
+        if fuzzy_score is None:
+            fuzzy_score = fuzzy_similarity(job_title_lower, keywords_str)
         
         return max(direct_score, fuzzy_score * 0.8)
     
-    def match_location(self, job_location: str, required_location: str) -> float:
+    def match_location(
+        self,
+        job_location: str,
+        required_location: str,
+        fuzzy_score: Optional[float] = None,
+        req_norm: Optional[Dict[str, Any]] = None
+    ) -> float:
         if not required_location:
             return 1.0
         
@@ -93,7 +414,7 @@ class JobMatcher:
             return 0.7
         
         job_location_lower = job_location.lower()
-        required_location_lower = required_location.lower()
+        required_location_lower = req_norm['location_lower'] if req_norm is not None else required_location.lower()
         
         if 'remote' in required_location_lower:
             if 'remote' in job_location_lower:
@@ -104,52 +425,93 @@ class JobMatcher:
         if required_location_lower in job_location_lower:
             return 1.0
         
-        fuzzy_score = fuzz.partial_ratio(job_location_lower, required_location_lower) / 100.0
-        return fuzzy_score
+        if fuzzy_score is None:
+            fuzzy_score = fuzzy_similarity(job_location_lower, required_location_lower)
+        return float(fuzzy_score)
+    
+    def match_skills(
+        self,
+        job: Dict,
+        required_skills: List[str],
+        job_text: Optional[str] = None,
+        req_norm: Optional[Dict[str, Any]] = None
+    ) -> float:
+        return self.skill_match_details(job, required_skills, job_text, req_norm)[0]
     
-    def match_skills(self, job: Dict, required_skills: List[str]) -> float:
+    def skill_match_details(
+        self,
+        job: Dict,
+        required_skills: List[str],
+        job_text: Optional[str] = None,
+        req_norm: Optional[Dict[str, Any]] = None,
+        hits: Optional[set] = None
+    ) -> Tuple[float, List[str]]:
+        """Skills score and the required skills the job text mentions directly"""
         if not required_skills:
-            return 1.0
+            return 1.0, []
+        
+        if job_text is None:
+            job_text = self.job_text(job)
+        if hits is None:
+            hits = self.keyword_hits(job_text)
         
-        job_text = f"{job.get('title', '')} {job.get('description', '')}".lower()
+        skills_lower = req_norm['skills_lower'] if req_norm is not None else [skill.lower() for skill in required_skills]
+        
+        job_mask = 0
+        for hit in hits:
+            job_mask |= self.skill_bits.get(hit, 0)
         
         matches = 0
-        for skill in required_skills:
-            skill_lower = skill.lower()
-            if skill_lower in job_text:
+        matched_skills = []
+        for skill, skill_lower in zip(required_skills, skills_lower):
+            # Skills outside the automaton's vocabulary still need a substring check
+            if skill_lower in hits or skill_lower in job_text:
                 matches += 1
+                matched_skills.append(skill)
             else:
-                for category, skills_list in self.skill_keywords.items():
-                    if skill_lower in skills_list:
-                        for related_skill in skills_list:
-                            if related_skill in job_text:
-                                matches += 0.5
-                                break
+                for category_mask in self.skill_to_related.get(skill_lower, ()):
+                    if job_mask & category_mask:
+                        matches += 0.5
         
-        return min(matches / len(required_skills), 1.0) if required_skills else 1.0
+        return min(matches / len(required_skills), 1.0), matched_skills
     
-    def match_experience_level(self, job: Dict, required_level: str) -> float:
+    def match_experience_level(
+        self,
+        job: Dict,
+        required_level: str,
+        job_text: Optional[str] = None,
+        detected_level: Optional[str] = None
+    ) -> float:
         if required_level == 'any':
             return 1.0
         
-        job_text = f"{job.get('title', '')} {job.get('description', '')}".lower()
+        if detected_level is None:
+            if job_text is None:
+                job_text = self.job_text(job)
+            _, detected_level = self.scan_text(job_text)
         
-        for level, keywords in self.experience_levels.items():
-            for keyword in keywords:
-                if keyword in job_text:
-                    if level == required_level:
-                        return 1.0
-                    elif (level == 'mid' and required_level in ['entry', 'senior']) or \
-                         (level == 'entry' and required_level == 'mid') or \
-                         (level == 'senior' and required_level == 'mid'):
-                        return 0.7
-                    else:
-                        return 0.3
-        
-        return 0.8
-    
-    def get_match_reasons(self, job: Dict, requirements: Dict[str, Any]) -> List[str]:
+        if detected_level is None:
+            return 0.8
+        if detected_level == required_level:
+            return 1.0
+        elif (detected_level == 'mid' and required_level in ['entry', 'senior']) or \
+             (detected_level == 'entry' and required_level == 'mid') or \
+             (detected_level == 'senior' and required_level == 'mid'):
+            return 0.7
+        else:
+            return 0.3
+    
+    def get_match_reasons(
+        self,
+        job: Dict,
+        requirements: Dict[str, Any],
+        job_text: Optional[str] = None,
+        req_norm: Optional[Dict[str, Any]] = None,
+        sub_scores: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
         reasons = []
+        if sub_scores is None:
+            _, sub_scores = self.score_breakdown(job, requirements, job_text=job_text, req_norm=req_norm)
         
         if requirements.get('keywords'):
             keywords_for_display = requirements['keywords']
@@ -158,29 +520,24 @@ class JobMatcher:
             else:
                 keywords_display_str = str(keywords_for_display)
             
-            title_score = self.match_title_keywords(job.get('title', ''), requirements['keywords'])
+            title_score = sub_scores['title']
             if title_score > 0.7:
                 reasons.append(f"Title closely matches '{keywords_display_str}'")
             elif title_score > 0.4:
                 reasons.append(f"Title partially matches '{keywords_display_str}'")
         
         if requirements.get('location'):
-            location_score = self.match_location(job.get('location', ''), requirements['location'])
+            location_score = sub_scores['location']
             if location_score > 0.8:
                 reasons.append(f"Location matches '{requirements['location']}'")
         
         if requirements.get('skills'):
-            job_text = f"{job.get('title', '')} {job.get('description', '')}".lower()
-            matched_skills = []
-            for skill in requirements['skills']:
-                if skill.lower() in job_text:
-                    matched_skills.append(skill)
-            
+            matched_skills = sub_scores['skills_matched']
             if matched_skills:
                 reasons.append(f"Mentions required skills: {', '.join(matched_skills)}")
         
         if requirements.get('experience_level') and requirements['experience_level'] != 'any':
-            exp_score = self.match_experience_level(job, requirements['experience_level'])
+            exp_score = sub_scores['experience']
             if exp_score > 0.8:
                 reasons.append(f"Matches {requirements['experience_level']} level experience")
         
@@ -195,7 +552,7 @@ class JobMatcher:
         
         return filtered_jobs
     
-    def meets_criteria(self, job: Dict, criteria: Dict[str, Any]) -> bool:
+    def meets_criteria(self, job: Dict, criteria: Dict[str, Any], job_text: Optional[str] = None) -> bool:
         if criteria.get('salary_min'):
             pass
         
@@ -203,17 +560,22 @@ class JobMatcher:
             pass
         
         if criteria.get('job_type') and criteria['job_type'] != 'any':
-            job_text = f"{job.get('title', '')} {job.get('description', '')}".lower()
             job_type = criteria['job_type'].lower()
+            job_type_keywords = self.job_type_keywords.get(job_type)
             
-            if job_type == 'remote':
-                if 'remote' not in job_text and 'work from home' not in job_text:
-                    return False
-            elif job_type == 'contract':
-                if 'contract' not in job_text and 'contractor' not in job_text:
-                    return False
-            elif job_type == 'part-time':
-                if 'part-time' not in job_text and 'part time' not in job_text:
+            if job_type_keywords:
+                if job_type == 'remote' and job.get('remote'):
+                    return True
+                
+                if job_text is None:
+                    job_text = self.job_text(job)
+                location_lower = (job.get('location') or '').lower()
+                if not self.keyword_hits(f"{job_text} {location_lower}").isdisjoint(job_type_keywords):
+                    return True
+                
+                # Scraped search cards carry no description, so a title that doesn't
+                # name the job type is no evidence against it; only judge full postings
+                if (job.get('description') or '').strip():
                     return False
         
         return True 
\ No newline at end of file
@@ -1,10 +1,14 @@
+import copy
+import functools
 import json
 import asyncio
-from typing import Dict, List, Any, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, Response
 from pydantic import BaseModel
 import uvicorn
 from datetime import datetime
@@ -15,10 +19,181 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data_collection.scraper_hr_ge import JobScraper
 from inference.job_matcher import JobMatcher
+from database.connection import ensure_indexes
+from database.cache import AsyncTTLCache
 from database.operations import ChatOperations, UserOperations
-from transformers import AutoTokenizer, AutoModelForCausalLM
+from transformers import (
+    AutoTokenizer,
+    AutoModelForCausalLM,
+    DynamicCache,
+    GenerationConfig,
+    StoppingCriteria,
+    StoppingCriteriaList,
+)
 import torch
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; fall back to plain substring checks
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "item"):  # numpy scalars from the matcher
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(payload: Any) -> str:
+    """Serialize a WebSocket payload; orjson handles datetimes and numpy values natively"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(payload, default=_json_default)
+
+
+def loads_json(data: str) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+# Prompt-lookup decoding arrived in transformers 4.37; older versions reject the kwarg
+PROMPT_LOOKUP_SUPPORTED = hasattr(GenerationConfig(), "prompt_lookup_num_tokens")
+
+# The instructions never change between requests, so their KV cache is computed
+# once at startup and only the per-message suffix is prefilled
+REQUIREMENTS_PROMPT_PREFIX = """
+            Extract job search requirements from the following message. When "Georgia" is mentioned, assume it refers to the country Georgia (საქართველო) unless explicitly stated as "Georgia USA" or "Atlanta". Return a JSON object with these fields:
+            - keywords: main job titles or skills mentioned
+            - location: any location preferences (if Georgia is mentioned, interpret as "Georgia (country)")
+            - experience_level: entry, mid, senior, or any
+            - job_type: full-time, part-time, contract, remote, or any
+            - salary_min: minimum salary if mentioned
+            - skills: list of required skills
+            - company_type: startup, enterprise, any, etc.
+            
+            Context: Georgia (country) has major cities like Tbilisi, Batumi, Kutaisi. Georgian companies include TBC Bank, Bank of Georgia, and many tech startups.
+            
+"""
+
+# Ends with the object's opening brace so the model starts emitting fields at once
+REQUIREMENTS_PROMPT_SUFFIX = """            Message: "{message}"
+            
+            JSON:
+            {{"""
+
+
+class JsonBraceScanner:
+    """Incremental brace matcher; state carries over between feed() calls.
+
+    Braces inside JSON strings are ignored.
+    """
+
+    def __init__(self, depth: int = 0):
+        self.depth = depth
+        self.in_string = False
+        self.escaped = False
+        self.closed = False
+
+    def feed(self, text: str) -> int:
+        """Index in `text` just past the brace that closes the object, or -1"""
+        for i, char in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.closed = True
+                    return i + 1
+        return -1
+
+
+def json_object_end(text: str, depth: int = 0) -> int:
+    """Index just past the brace that closes the object, or -1 if it never closes.
+
+    `depth` is how many braces are already open before `text` starts.
+    """
+    return JsonBraceScanner(depth).feed(text)
+
+
+class JsonObjectStoppingCriteria(StoppingCriteria):
+    """Stop generating once every row has closed the JSON object opened by the prompt"""
+
+    def __init__(self, tokenizer, prompt_length: int):
+        self.tokenizer = tokenizer
+        # Tokens before this column have already been scanned
+        self.scanned_length = prompt_length
+        self.scanners: List[JsonBraceScanner] = []
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> bool:
+        if not self.scanners:
+            self.scanners = [JsonBraceScanner(depth=1) for _ in range(input_ids.shape[0])]
+
+        # Only the tokens added since the last step are decoded (one, or a few
+        # accepted at once under assisted decoding)
+        new_text = self.tokenizer.batch_decode(input_ids[:, self.scanned_length:], skip_special_tokens=True)
+        self.scanned_length = input_ids.shape[1]
+
+        for scanner, text in zip(self.scanners, new_text):
+            if not scanner.closed:
+                scanner.feed(text)
+        return all(scanner.closed for scanner in self.scanners)
+
+# Keyword lists for simple_requirement_extraction; earlier entries take precedence
+GEORGIAN_CITIES = ["tbilisi", "batumi", "kutaisi", "rustavi", "gori", "zugdidi", "poti", "kobuleti"]
+US_GEORGIA_INDICATORS = ["atlanta", "savannah", "columbus", "augusta", "georgia usa", "georgia us", "us state"]
+# First "in/at/near/from " that starts a word, e.g. not the "in " ending "begin "
+LOCATION_INDICATOR_RE = re.compile(r"\b(?:in|at|near|from) ")
+JOB_TITLE_KEYWORDS = ["developer", "engineer", "scientist", "analyst", "manager", "designer", "consultant", "programmer", "architect", "specialist"]
+TECH_KEYWORDS = ["python", "javascript", "react", "node", "java", "sql", "aws", "docker", "kubernetes", "frontend", "backend", "fullstack", "devops"]
+GENERAL_JOB_TERMS = ["job", "work", "position", "opportunity", "career", "employment"]
+EXPERIENCE_KEYWORDS = {
+    "senior": ["senior", "sr", "lead"],
+    "entry": ["junior", "jr", "entry", "graduate"],
+    "mid": ["mid", "intermediate"],
+}
+JOB_TYPE_KEYWORDS = {
+    "remote": ["remote"],
+    "contract": ["contract"],
+    "part-time": ["part-time", "part time"],
+    "full-time": ["full-time", "full time"],
+}
+
+EXTRACTION_VOCABULARY = sorted({
+    "georgia",
+    *GEORGIAN_CITIES, *US_GEORGIA_INDICATORS, *JOB_TITLE_KEYWORDS, *TECH_KEYWORDS, *GENERAL_JOB_TERMS,
+    *(word for words in EXPERIENCE_KEYWORDS.values() for word in words),
+    *(word for words in JOB_TYPE_KEYWORDS.values() for word in words),
+})
+
+EXTRACTION_AUTOMATON = None
+if ahocorasick is not None:
+    EXTRACTION_AUTOMATON = ahocorasick.Automaton()
+    for keyword in EXTRACTION_VOCABULARY:
+        EXTRACTION_AUTOMATON.add_word(keyword, keyword)
+    EXTRACTION_AUTOMATON.make_automaton()
+
+
+def extraction_keyword_hits(message_lower: str) -> set:
+    """Vocabulary keywords occurring anywhere in the message (substring semantics)"""
+    if EXTRACTION_AUTOMATON is not None:
+        return {keyword for _, keyword in EXTRACTION_AUTOMATON.iter(message_lower)}
+    return {keyword for keyword in EXTRACTION_VOCABULARY if keyword in message_lower}
+
 
 class JobSearchRequest(BaseModel):
     message: str
@@ -36,13 +211,22 @@ class JobSearchResponse(BaseModel):
 
 
 class MCPJobServer:
-    def __init__(self, trained_model_path: Optional[str] = None):
+    def __init__(
+        self,
+        trained_model_path: Optional[str] = None,
+        max_batch_size: int = 8,
+        max_batch_latency: float = 0.05,
+        prompt_lookup_num_tokens: int = 10,
+        max_scrape_workers: int = 8,
+    ):
         self.app = FastAPI(title="MCP Job Search Server")
         self.setup_cors()
         self.setup_routes()
 
         # Initialize components
         self.scraper = JobScraper()
+        # Bounds concurrent scrapes (and so outbound HTTP fan-out) across all clients
+        self._scrape_pool = ThreadPoolExecutor(max_workers=max_scrape_workers, thread_name_prefix="scrape")
         self.matcher = JobMatcher()
         self.active_connections: List[WebSocket] = []
 
@@ -54,8 +238,18 @@ class MCPJobServer:
         self.trained_model_path = trained_model_path
         self.is_trained_model = False
 
+        # Extraction prompts are coalesced into one padded generate call
+        self.max_batch_size = max_batch_size
+        self.max_batch_latency = max_batch_latency
+        self.prompt_lookup_num_tokens = prompt_lookup_num_tokens
+        self._prompt_queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self.requirements_cache = AsyncTTLCache(maxsize=4096, ttl=3600)
+
         # Initialize LLM for chat
         self.setup_llm()
+        self.setup_generation()
+        self.setup_prompt_cache()
 
     def setup_cors(self):
         """Setup CORS middleware"""
@@ -87,12 +281,30 @@ class MCPJobServer:
             model_id = "openchat/openchat-3.5-0106"
             print(f"📱 Loading base model: {model_id}")
             self.tokenizer = AutoTokenizer.from_pretrained(model_id)
-            self.model = AutoModelForCausalLM.from_pretrained(
-                model_id,
-                load_in_4bit=True,
-                device_map="auto",
-                torch_dtype=torch.float16,
-            )
+            self.model = None
+            for label, make_quant_type in self.torchao_quant_types():
+                try:
+                    from transformers import TorchAoConfig
+                    print(f"⚡ Quantizing base model to {label}")
+                    self.model = AutoModelForCausalLM.from_pretrained(
+                        model_id,
+                        device_map="auto",
+                        torch_dtype=torch.bfloat16,
+                        quantization_config=TorchAoConfig(quant_type=make_quant_type()),
+                    )
+                    break
+                except Exception as e:
+                    # e.g. a transformers whose TorchAoConfig predates config objects
+                    print(f"⚠️ TorchAO {label} load failed: {e}")
+                    self.model = None
+                    torch.cuda.empty_cache()  # release whatever the partial load allocated
+            if self.model is None:
+                self.model = AutoModelForCausalLM.from_pretrained(
+                    model_id,
+                    load_in_4bit=True,
+                    device_map="auto",
+                    torch_dtype=torch.float16,
+                )
             self.is_trained_model = False
             print("✅ Base LLM initialized successfully")
             
@@ -102,12 +314,106 @@ class MCPJobServer:
             self.model = None
             self.is_trained_model = False
 
+    def setup_generation(self):
+        """Resolve tokenizer padding and the fixed generate kwargs once"""
+        self._generation_kwargs = {}
+        if not self.model or not self.tokenizer:
+            return
+
+        # Decoder-only models continue from the last position, so pad on the left
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        pad_token_id = self.tokenizer.pad_token_id
+        self.model.generation_config.pad_token_id = pad_token_id
+
+        self._generation_kwargs = dict(
+            max_new_tokens=150,
+            temperature=0.7,
+            do_sample=True,
+            use_cache=True,
+            pad_token_id=pad_token_id,
+        )
+
+    def setup_prompt_cache(self):
+        """Prefill the fixed extraction instructions once and keep their KV cache"""
+        self._prompt_prefix_ids = None
+        self._prompt_cache = None
+        if not self.model or not self.tokenizer:
+            return
+
+        try:
+            prefix_ids = self.tokenizer(REQUIREMENTS_PROMPT_PREFIX, return_tensors="pt")["input_ids"].to(self.model.device)
+            with torch.inference_mode():
+                outputs = self.model(input_ids=prefix_ids, use_cache=True)
+            cache = outputs.past_key_values
+            if isinstance(cache, tuple):
+                cache = DynamicCache.from_legacy_cache(cache)
+            self._prompt_prefix_ids = prefix_ids
+            self._prompt_prefix_mask = torch.ones_like(prefix_ids)
+            self._prompt_cache = cache
+            print(f"✅ Cached KV for {prefix_ids.shape[1]}-token extraction prompt")
+        except Exception as e:
+            print(f"⚠️ Prompt cache unavailable, prefilling full prompts: {e}")
+
+    @staticmethod
+    def supports_torchao() -> bool:
+        """TorchAO int4 loading needs CUDA, torchao's Int4WeightOnlyConfig, and TorchAoConfig"""
+        if not torch.cuda.is_available():
+            return False
+        try:
+            from torchao.quantization import Int4WeightOnlyConfig  # noqa: F401
+            from transformers import TorchAoConfig  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @staticmethod
+    def supports_fp8() -> bool:
+        """FP8 matmuls need an Ada/Hopper (sm_89+) GPU and torchao's float8 config"""
+        if not torch.cuda.is_available() or torch.cuda.get_device_capability() < (8, 9):
+            return False
+        try:
+            from torchao.quantization import Float8DynamicActivationFloat8WeightConfig  # noqa: F401
+            from transformers import TorchAoConfig  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def torchao_quant_types(self) -> List[Tuple[str, Callable[[], Any]]]:
+        """TorchAO quantizations to try in order; bitsandbytes 4-bit is the fallback after them"""
+        candidates = []
+        if self.supports_fp8():
+            # FP8 weights and activations: half the weight bytes of fp16 and
+            # native FP8 tensor-core matmuls instead of bitsandbytes dequant kernels
+            from torchao.quantization import Float8DynamicActivationFloat8WeightConfig
+            candidates.append(("FP8 (E4M3)", Float8DynamicActivationFloat8WeightConfig))
+        if self.supports_torchao():
+            # Same 4-bit footprint as bitsandbytes NF4, but the int4 matmul fuses
+            # the dequant (tinygemm) and is much faster for small-batch decode
+            from torchao.quantization import Int4WeightOnlyConfig
+            candidates.append(("int4 (weight-only)", functools.partial(Int4WeightOnlyConfig, group_size=128)))
+        return candidates
+
     def setup_routes(self):
         """Setup API routes"""
         
         # Mount static files for CSS, JS, etc.
         self.app.mount("/static", StaticFiles(directory="static"), name="static")
 
+        @self.app.on_event("startup")
+        async def startup():
+            try:
+                await ensure_indexes()
+            except Exception as e:
+                print(f"⚠️ Could not ensure database indexes: {e}")
+
+        @self.app.on_event("shutdown")
+        async def shutdown():
+            await self.stop_batcher()
+            await self.user_ops.stop_interaction_flusher()
+            self._scrape_pool.shutdown(wait=False, cancel_futures=True)
+
         @self.app.get("/")
         async def root():
             return {"message": "MCP Job Search Server is running"}
@@ -120,10 +426,12 @@ class MCPJobServer:
         async def websocket_endpoint(websocket: WebSocket, user_id: str):
             await self.websocket_handler(websocket, user_id)
 
-        @self.app.post("/search_jobs")
-        async def search_jobs(request: JobSearchRequest):
+        @self.app.post("/search_jobs", response_model=None)
+        async def search_jobs(request: JobSearchRequest) -> Response:
             """REST API endpoint for job search"""
-            return await self.process_job_search(request.message, request.user_id, request.chat_id)
+            result = await self.process_job_search(request.message, request.user_id, request.chat_id)
+            # The result is plain JSON data, so skip FastAPI's jsonable_encoder walk over every job
+            return Response(content=dumps_json(result), media_type="application/json")
 
         @self.app.get("/api/chat_history/{user_id}")
         async def get_chat_history(user_id: str, limit: int = 50):
@@ -143,6 +451,11 @@ class MCPJobServer:
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
+    async def send_message(self, websocket: WebSocket, message_type: str, **fields):
+        """Send one timestamped JSON message to a WebSocket client"""
+        payload = {"type": message_type, **fields, "timestamp": datetime.now()}
+        await websocket.send_text(dumps_json(payload))
+
     async def websocket_handler(self, websocket: WebSocket, user_id: str):
         """Handle WebSocket connections for real-time chat"""
         await websocket.accept()
@@ -152,141 +465,86 @@ class MCPJobServer:
             while True:
                 # Receive message from client
                 data = await websocket.receive_text()
-                message_data = json.loads(data)
+                message_data = loads_json(data)
 
                 message_type = message_data.get("type", "job_search")
 
                 if message_type == "job_search" or "message" in message_data:
-                    # Handle job search request
+                    # Handle job search request, streaming stage updates as they complete
+                    async def send_progress(stage: str, data: Dict[str, Any]):
+                        await self.send_message(websocket, "job_search_progress", stage=stage, data=data)
+
                     response = await self.process_job_search(
                         message_data.get("message", ""), 
                         user_id, 
                         message_data.get("chat_id"),
-                        message_data.get("message_id")
+                        message_data.get("message_id"),
+                        progress=send_progress
                     )
 
                     # Send response back to client
-                    await websocket.send_text(
-                        json.dumps(
-                            {
-                                "type": "job_search_response",
-                                "data": response,
-                                "timestamp": datetime.now().isoformat(),
-                            }
-                        )
-                    )
+                    await self.send_message(websocket, "job_search_response", data=response)
 
                 elif message_type == "save_chat":
                     # Handle chat history saving
                     try:
                         chat_data = message_data.get("chat_data", {})
                         await self.chat_ops.save_chat(chat_data)
-                        await websocket.send_text(
-                            json.dumps({
-                                "type": "chat_saved",
-                                "data": {"success": True},
-                                "timestamp": datetime.now().isoformat()
-                            })
-                        )
+                        await self.send_message(websocket, "chat_saved", data={"success": True})
                     except Exception as e:
-                        await websocket.send_text(
-                            json.dumps({
-                                "type": "error",
-                                "message": f"Failed to save chat: {str(e)}",
-                                "timestamp": datetime.now().isoformat()
-                            })
-                        )
+                        await self.send_message(websocket, "error", message=f"Failed to save chat: {str(e)}")
 
                 elif message_type == "load_chat_history":
                     # Handle chat history loading
                     try:
                         chats = await self.chat_ops.get_user_chats(user_id, limit=50)
-                        await websocket.send_text(
-                            json.dumps({
-                                "type": "chat_history",
-                                "data": {"chats": chats},
-                                "timestamp": datetime.now().isoformat()
-                            })
-                        )
+                        await self.send_message(websocket, "chat_history", data={"chats": chats})
                     except Exception as e:
-                        await websocket.send_text(
-                            json.dumps({
-                                "type": "error",
-                                "message": f"Failed to load chat history: {str(e)}",
-                                "timestamp": datetime.now().isoformat()
-                            })
-                        )
+                        await self.send_message(websocket, "error", message=f"Failed to load chat history: {str(e)}")
 
                 elif message_type == "clear_chat_history":
                     # Handle chat history clearing
                     try:
                         deleted_count = await self.chat_ops.clear_user_chats(user_id)
-                        await websocket.send_text(
-                            json.dumps({
-                                "type": "chat_history_cleared",
-                                "data": {"deleted_count": deleted_count},
-                                "timestamp": datetime.now().isoformat()
-                            })
-                        )
+                        await self.send_message(websocket, "chat_history_cleared", data={"deleted_count": deleted_count})
                     except Exception as e:
-                        await websocket.send_text(
-                            json.dumps({
-                                "type": "error",
-                                "message": f"Failed to clear chat history: {str(e)}",
-                                "timestamp": datetime.now().isoformat()
-                            })
-                        )
+                        await self.send_message(websocket, "error", message=f"Failed to clear chat history: {str(e)}")
 
                 elif message_type == "get_chat":
                     # Handle specific chat loading
                     try:
                         chat_id = message_data.get("chat_id")
                         chat = await self.chat_ops.get_chat_by_id(chat_id, user_id)
-                        await websocket.send_text(
-                            json.dumps({
-                                "type": "chat_loaded",
-                                "data": {"chat": chat},
-                                "timestamp": datetime.now().isoformat()
-                            })
-                        )
+                        await self.send_message(websocket, "chat_loaded", data={"chat": chat})
                     except Exception as e:
-                        await websocket.send_text(
-                            json.dumps({
-                                "type": "error",
-                                "message": f"Failed to load chat: {str(e)}",
-                                "timestamp": datetime.now().isoformat()
-                            })
-                        )
+                        await self.send_message(websocket, "error", message=f"Failed to load chat: {str(e)}")
 
                 else:
-                    await websocket.send_text(
-                        json.dumps({
-                            "type": "error",
-                            "message": f"Unknown message type: {message_type}",
-                            "timestamp": datetime.now().isoformat()
-                        })
-                    )
+                    await self.send_message(websocket, "error", message=f"Unknown message type: {message_type}")
 
         except WebSocketDisconnect:
             self.active_connections.remove(websocket)
         except Exception as e:
-            await websocket.send_text(
-                json.dumps(
-                    {
-                        "type": "error",
-                        "message": f"Error processing request: {str(e)}",
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
-            )
-
-    async def process_job_search(self, message: str, user_id: str, chat_id: Optional[str] = None, message_id: Optional[str] = None) -> Dict[str, Any]:
-        """Process job search request and return results"""
+            await self.send_message(websocket, "error", message=f"Error processing request: {str(e)}")
+
+    async def process_job_search(
+        self,
+        message: str,
+        user_id: str,
+        chat_id: Optional[str] = None,
+        message_id: Optional[str] = None,
+        progress: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """Process job search request and return results.
+
+        `progress`, when given, is awaited with (stage, data) as each stage finishes
+        so a client can render partial results before the full response.
+        """
         try:
             print(f"Processing job search for user {user_id}: {message}")
             start_time = datetime.now()
 
-            # Log user interaction if needed
+            # Log user interaction if needed; buffered and written in bulk off the request path
             try:
                 from database.models import UserInteraction
                 interaction = UserInteraction(
@@ -296,25 +554,39 @@ class MCPJobServer:
                     message_type="job_search_query",
                     language="english"  # Could be detected from message
                 )
-                await self.user_ops.log_interaction(interaction)
+                await self.user_ops.log_interaction_batch(interaction)
             except Exception as e:
                 print(f"Failed to log interaction: {e}")
 
-            requirements = await self.extract_requirements(message)
+            # Scraping is network-bound, so while the LLM runs start it on the keyword-
+            # extraction result; it is reused if the LLM settles on an equivalent query.
+            # Without a model extraction is instant, so there is nothing to overlap
+            message_lower = message.lower()
+            speculative_query = None
+            speculative_scrape = None
+            if self.model is not None and self.tokenizer is not None:
+                speculative_query = self.scrape_query(self.simple_requirement_extraction(message, message_lower))
+                if speculative_query:
+                    speculative_scrape = self.start_scrape(speculative_query)
+
+            requirements = await self.extract_requirements(message, message_lower)
             print(f"Extracted requirements: {requirements}")
+            if progress:
+                await progress("requirements_extracted", {"requirements_extracted": requirements})
 
             jobs = []
-            if requirements.get("keywords"):
-                # Convert keywords list to string for scrapers
-                keywords_str = " ".join(requirements["keywords"]) if isinstance(requirements["keywords"], list) else str(requirements["keywords"])
-                
-                jobs = self.scraper.scrape_all_sources(
-                    keywords=keywords_str,
-                    location=requirements.get("location", ""),
-                    limit_per_source=10,
-                )
+            query = self.scrape_query(requirements)
+            if speculative_scrape is not None and query and \
+                    self.normalize_scrape_query(query) == self.normalize_scrape_query(speculative_query):
+                jobs = await speculative_scrape
+            elif query:
+                jobs = await self.start_scrape(query)
 
-            matched_jobs = self.matcher.match_jobs(jobs, requirements)
+            if progress:
+                await progress("jobs_found", {"total_jobs_found": len(jobs)})
+
+            # The scraped dicts are ours, so annotate them rather than copying each match
+            matched_jobs = self.matcher.match_jobs(jobs, requirements, in_place=True)
 
             response_text = await self.generate_response(
                 message, requirements, matched_jobs
@@ -331,7 +603,7 @@ class MCPJobServer:
                     interaction.matched_jobs = [str(job.get("id", "")) for job in matched_jobs if job.get("id")]
                     interaction.search_results_count = len(matched_jobs)
                     interaction.response_time_ms = response_time_ms
-                    await self.user_ops.log_interaction(interaction)
+                    await self.user_ops.log_interaction_batch(interaction)
             except Exception as e:
                 print(f"Failed to update interaction: {e}")
 
@@ -359,138 +631,260 @@ class MCPJobServer:
                 "model_used": "trained" if self.is_trained_model else "base"
             }
 
-    async def extract_requirements(self, message: str) -> Dict[str, Any]:
+    @staticmethod
+    def scrape_query(requirements: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """(keywords, location) to scrape for, or None when there are no keywords"""
+        keywords = requirements.get("keywords")
+        if not keywords:
+            return None
+        # Convert keywords list to string for scrapers
+        keywords_str = " ".join(keywords) if isinstance(keywords, list) else str(keywords)
+        return keywords_str, requirements.get("location", "")
+
+    @staticmethod
+    def normalize_scrape_query(query: Tuple[str, str]) -> Tuple[frozenset, str]:
+        """Order- and case-insensitive form of a scrape query, for comparing two of them"""
+        keywords_str, location = query
+        keyword_tokens = frozenset(re.findall(r"[\w+#]+", keywords_str.lower()))
+        return keyword_tokens, " ".join((location or "").lower().split())
+
+    def start_scrape(self, query: Tuple[str, str]) -> asyncio.Future:
+        """Run scrape_all_sources on the bounded scrape pool"""
+        keywords_str, location = query
+        scrape = functools.partial(
+            self.scraper.scrape_all_sources,
+            keywords=keywords_str,
+            location=location,
+            limit_per_source=10,
+        )
+        task = asyncio.get_running_loop().run_in_executor(self._scrape_pool, scrape)
+        # A discarded speculative scrape must not log "exception was never retrieved"
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def extract_requirements(self, message: str, message_lower: Optional[str] = None) -> Dict[str, Any]:
         """Extract job requirements from user message using LLM"""
+        if message_lower is None:
+            message_lower = message.lower()
+        if not self.model or not self.tokenizer:
+            return self.simple_requirement_extraction(message, message_lower)
+
+        # Repeated queries ("python developer in tbilisi") skip generation entirely.
+        # Failures raise, so they are not cached and the next request samples again
+        cache_key = " ".join(message_lower.split())
         try:
-            if not self.model or not self.tokenizer:
-                return self.simple_requirement_extraction(message)
-
-            prompt = f"""
-            Extract job search requirements from the following message. When "Georgia" is mentioned, assume it refers to the country Georgia (საქართველო) unless explicitly stated as "Georgia USA" or "Atlanta". Return a JSON object with these fields:
-            - keywords: main job titles or skills mentioned
-            - location: any location preferences (if Georgia is mentioned, interpret as "Georgia (country)")
-            - experience_level: entry, mid, senior, or any
-            - job_type: full-time, part-time, contract, remote, or any
-            - salary_min: minimum salary if mentioned
-            - skills: list of required skills
-            - company_type: startup, enterprise, any, etc.
-            
-            Context: Georgia (country) has major cities like Tbilisi, Batumi, Kutaisi. Georgian companies include TBC Bank, Bank of Georgia, and many tech startups.
-            
-            Message: "{message}"
-            
-            JSON:
-            """
+            requirements = await self.requirements_cache.get_or_fetch(
+                cache_key, lambda: self.llm_extract_requirements(message)
+            )
+        except Exception as e:
+            print(f"LLM extraction failed: {e}")
+            return self.simple_requirement_extraction(message, message_lower)
+
+        # Callers get their own copy so the cached dict stays untouched
+        return copy.deepcopy(requirements)
+
+    async def llm_extract_requirements(self, message: str) -> Dict[str, Any]:
+        """Ask the LLM for requirements JSON; ValueError when its output doesn't parse"""
+        prompt = REQUIREMENTS_PROMPT_SUFFIX.format(message=message)
+
+        response = await self._enqueue_prompt(prompt)
+
+        # The prompt supplied the opening brace; keep everything up to the matching close
+        response = "{" + response
+        json_end = json_object_end(response)
+
+        if json_end == -1:
+            raise ValueError("no complete JSON object in the model output")
+        # json.JSONDecodeError is a ValueError too
+        requirements = json.loads(response[:json_end])
+        if not isinstance(requirements, dict):
+            raise ValueError("model output is not a JSON object")
+        return requirements
+
+    async def _enqueue_prompt(self, prompt: str) -> str:
+        """Queue a prompt for the batcher and wait for its completion"""
+        if self._batcher is None or self._batcher.done():
+            self.start_batcher()
+        future = asyncio.get_running_loop().create_future()
+        await self._prompt_queue.put((prompt, future))
+        return await future
+
+    def start_batcher(self):
+        """Start the background task that batches queued prompts"""
+        if self._prompt_queue is None:
+            self._prompt_queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+
+    async def stop_batcher(self):
+        """Stop the batcher, failing any prompts still queued"""
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+
+        if self._prompt_queue is not None:
+            while not self._prompt_queue.empty():
+                _, future = self._prompt_queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("Server shutting down"))
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Block for the first prompt, then coalesce for up to max_batch_latency
+            batch = [await self._prompt_queue.get()]
+            deadline = loop.time() + self.max_batch_latency
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._prompt_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
 
-            # Tokenize and generate
-            inputs = self.tokenizer(prompt, return_tensors="pt", truncation=True, max_length=512)
-            
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_length=inputs["input_ids"].shape[1] + 150,
-                    temperature=0.7,
-                    do_sample=True,
-                    pad_token_id=self.tokenizer.eos_token_id
-                )
+            prompts = [prompt for prompt, _ in batch]
+            try:
+                # generate blocks, so keep it off the event loop
+                responses = await asyncio.to_thread(self._generate_batch, prompts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+
+    def _to_model_device(self, encoding) -> Dict[str, torch.Tensor]:
+        """Move tokenizer output to the model; on CUDA via pinned memory so the copy is async"""
+        device = self.model.device
+        if device.type != "cuda":
+            return {name: tensor.to(device) for name, tensor in encoding.items()}
+        return {name: tensor.pin_memory().to(device, non_blocking=True) for name, tensor in encoding.items()}
+
+    def _generate_batch(self, prompts: List[str]) -> List[str]:
+        """One padded generate call over several prompt suffixes; returns only the generated text"""
+        generate_kwargs = dict(self._generation_kwargs)
+        if self._prompt_cache is not None:
+            prefix_length = self._prompt_prefix_ids.shape[1]
+            suffixes = self.tokenizer(
+                prompts,
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=512 - prefix_length,
+                add_special_tokens=False,
+            )
+            suffixes = self._to_model_device(suffixes)
+
+            # Cached prefix + padded suffix; generate only prefills the uncached suffix
+            # tokens, and the mask keeps the suffix pads out of attention
+            batch_size = suffixes["input_ids"].shape[0]
+            inputs = {
+                "input_ids": torch.cat([self._prompt_prefix_ids.expand(batch_size, -1), suffixes["input_ids"]], dim=1),
+                "attention_mask": torch.cat([self._prompt_prefix_mask.expand(batch_size, -1), suffixes["attention_mask"]], dim=1),
+            }
 
-            response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            
-            # Extract JSON from response
-            json_start = response.find("{")
-            json_end = response.rfind("}") + 1
-            
-            if json_start != -1 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                try:
-                    requirements = json.loads(json_str)
-                    return requirements
-                except json.JSONDecodeError:
-                    pass
+            # generate extends the cache in place, so every batch gets its own copy
+            cache = copy.deepcopy(self._prompt_cache)
+            if batch_size > 1:
+                if hasattr(cache, "batch_repeat_interleave"):
+                    cache.batch_repeat_interleave(batch_size)
+                else:
+                    # transformers < 4.42 has no helper; repeat each layer's tensors
+                    cache.key_cache = [k.repeat_interleave(batch_size, dim=0) for k in cache.key_cache]
+                    cache.value_cache = [v.repeat_interleave(batch_size, dim=0) for v in cache.value_cache]
+            generate_kwargs["past_key_values"] = cache
+        else:
+            inputs = self.tokenizer(
+                [REQUIREMENTS_PROMPT_PREFIX + prompt for prompt in prompts],
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=512,
+            ).to(self.model.device)
+
+        # Prompt-lookup speculation: the JSON answer mostly repeats n-grams from the
+        # prompt (field names, city names), so candidates drafted from it are usually
+        # accepted. transformers only supports assisted decoding for single-row batches
+        if len(prompts) == 1 and PROMPT_LOOKUP_SUPPORTED:
+            generate_kwargs["prompt_lookup_num_tokens"] = self.prompt_lookup_num_tokens
+
+        prompt_length = inputs["input_ids"].shape[1]
+        # Nothing after the closing brace is parsed, so stop as soon as every row has one
+        generate_kwargs["stopping_criteria"] = StoppingCriteriaList(
+            [JsonObjectStoppingCriteria(self.tokenizer, prompt_length)]
+        )
 
-            return self.simple_requirement_extraction(message)
+        # Decode steps are not captured into CUDA graphs: replay needs static shapes,
+        # but the prefix cache above is a DynamicCache that grows every token, and the
+        # pinned transformers has no static cache to seed from the shared prefix
+        with torch.inference_mode():
+            outputs = self.model.generate(**inputs, **generate_kwargs)
 
-        except Exception as e:
-            print(f"LLM extraction failed: {e}")
-            return self.simple_requirement_extraction(message)
+        return self.tokenizer.batch_decode(outputs[:, prompt_length:], skip_special_tokens=True)
 
-    def simple_requirement_extraction(self, message: str) -> Dict[str, Any]:
+    def simple_requirement_extraction(self, message: str, message_lower: Optional[str] = None) -> Dict[str, Any]:
         """Simple keyword-based requirement extraction fallback with Georgian context"""
-        message_lower = message.lower()
+        if message_lower is None:
+            message_lower = message.lower()
+        # Every known keyword in the message, found in one pass
+        hits = extraction_keyword_hits(message_lower)
         
         # Extract location with Georgia-specific handling FIRST
         location = ""
         
         # Check for Georgian cities first
-        georgian_cities = ["tbilisi", "batumi", "kutaisi", "rustavi", "gori", "zugdidi", "poti", "kobuleti"]
-        for city in georgian_cities:
-            if city in message_lower:
+        for city in GEORGIAN_CITIES:
+            if city in hits:
                 location = f"{city.capitalize()}, Georgia (country)"
                 break
         
         # Check for Georgia country references
         if not location:
-            if "georgia" in message_lower:
+            if "georgia" in hits:
                 # Check if it's explicitly US Georgia
-                if any(indicator in message_lower for indicator in ["atlanta", "savannah", "columbus", "augusta", "georgia usa", "georgia us", "us state"]):
+                if not hits.isdisjoint(US_GEORGIA_INDICATORS):
                     location = "Georgia, USA"
                 else:
                     # Default to Georgia country
                     location = "Georgia (country)"
             else:
                 # General location extraction
-                location_indicators = ["in ", "at ", "near ", "from "]
-                for indicator in location_indicators:
-                    if indicator in message_lower:
-                        start = message_lower.find(indicator) + len(indicator)
-                        location_part = message[start:start+50].split()[0:3]  # Take next few words
-                        location = " ".join(location_part).strip(",.!?")
-                        break
+                match = LOCATION_INDICATOR_RE.search(message_lower)
+                if match:
+                    start = match.end()
+                    location_part = message[start:start+50].split()[0:3]  # Take next few words
+                    location = " ".join(location_part).strip(",.!?")
         
-        # Extract job titles/keywords (exclude location words)
-        job_keywords = []
-        exclude_words = {"georgia", "tbilisi", "batumi", "kutaisi", "rustavi", "gori", "country", "in", "at", "near", "from"}
-        
-        # Job title keywords
-        job_titles = ["developer", "engineer", "scientist", "analyst", "manager", "designer", "consultant", "programmer", "architect", "specialist"]
-        for keyword in job_titles:
-            if keyword in message_lower and keyword not in exclude_words:
-                job_keywords.append(keyword)
-        
-        # Technology keywords
-        tech_keywords = ["python", "javascript", "react", "node", "java", "sql", "aws", "docker", "kubernetes", "frontend", "backend", "fullstack", "devops"]
-        for tech in tech_keywords:
-            if tech in message_lower and tech not in exclude_words:
-                job_keywords.append(tech)
+        # Extract job titles/keywords (none of these overlap the location words)
+        job_keywords = [keyword for keyword in JOB_TITLE_KEYWORDS if keyword in hits]
+        job_keywords.extend(tech for tech in TECH_KEYWORDS if tech in hits)
         
         # If no specific job keywords found but location is specified, add general terms
         if not job_keywords and location:
             # Look for general job-related terms
-            general_terms = ["job", "work", "position", "opportunity", "career", "employment"]
-            for term in general_terms:
-                if term in message_lower:
-                    job_keywords.append("job opportunities")
-                    break
+            if not hits.isdisjoint(GENERAL_JOB_TERMS):
+                job_keywords.append("job opportunities")
         
         # Extract experience level
         experience_level = "any"
-        if any(word in message_lower for word in ["senior", "sr", "lead"]):
-            experience_level = "senior"
-        elif any(word in message_lower for word in ["junior", "jr", "entry", "graduate"]):
-            experience_level = "entry"
-        elif any(word in message_lower for word in ["mid", "intermediate"]):
-            experience_level = "mid"
+        for level, words in EXPERIENCE_KEYWORDS.items():
+            if not hits.isdisjoint(words):
+                experience_level = level
+                break
         
         # Extract job type
         job_type = "any"
-        if "remote" in message_lower:
-            job_type = "remote"
-        elif "contract" in message_lower:
-            job_type = "contract"
-        elif "part-time" in message_lower or "part time" in message_lower:
-            job_type = "part-time"
-        elif "full-time" in message_lower or "full time" in message_lower:
-            job_type = "full-time"
+        for type_name, words in JOB_TYPE_KEYWORDS.items():
+            if not hits.isdisjoint(words):
+                job_type = type_name
+                break
 
         return {
             "keywords": job_keywords,
@@ -554,8 +948,23 @@ class MCPJobServer:
         return base_response
 
 
-def run_server(host: str = "0.0.0.0", port: int = 8000, trained_model_path: Optional[str] = None):
-    """Run the MCP Job Server (with optional trained model)"""
+def create_app() -> FastAPI:
+    """App factory for multi-worker uvicorn; each worker process builds its own server"""
+    return MCPJobServer(trained_model_path=os.environ.get("JOB_SERVER_TRAINED_MODEL") or None).app
+
+
+def run_server(
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    trained_model_path: Optional[str] = None,
+    workers: int = 1,
+):
+    """Run the MCP Job Server (with optional trained model).
+
+    With workers > 1, uvicorn forks that many processes, so one request's scrape
+    or generate no longer stalls every other client. Each worker loads its own
+    copy of the model, so size `workers` to the available (V)RAM.
+    """
     model_info = "🎯 Trained Model" if trained_model_path else "📱 Base Model"
     print(f"🚀 Starting Job Search AI Server ({model_info}) on {host}:{port}")
     print(f"📱 Open your browser to: http://localhost:{port}/chatbox")
@@ -564,6 +973,13 @@ def run_server(host: str = "0.0.0.0", port: int = 8000, trained_model_path: Opti
     if trained_model_path:
         print(f"🎯 Using trained model from: {trained_model_path}")
     
+    if workers > 1:
+        print(f"👥 Starting {workers} worker processes")
+        # Workers import the app by name, so the model path travels via the environment
+        os.environ["JOB_SERVER_TRAINED_MODEL"] = trained_model_path or ""
+        uvicorn.run("inference.server:create_app", factory=True, host=host, port=port, workers=workers)
+        return
+
     server = MCPJobServer(trained_model_path=trained_model_path)
     uvicorn.run(server.app, host=host, port=port)
 
@@ -4,21 +4,49 @@ from transformers import (
     AutoModelForCausalLM,
     TrainingArguments,
     Trainer,
-    DataCollatorForLanguageModeling,
+    DataCollatorForSeq2Seq,
     EarlyStoppingCallback,
+    BitsAndBytesConfig,
 )
+from transformers.utils import is_flash_attn_2_available
 from peft.mapping import get_peft_model
 from peft.tuners.lora import LoraConfig
 from peft.peft_model import PeftModel
 from peft.utils.peft_types import TaskType
-from datasets import DatasetDict
+from peft.utils.other import (
+    TRANSFORMERS_MODELS_TO_LORA_TARGET_MODULES_MAPPING,
+    prepare_model_for_kbit_training,
+)
+from datasets import DatasetDict, load_from_disk
 import os
 import json
+import hashlib
 from pathlib import Path
 
 
+class CausalLMDataCollator(DataCollatorForSeq2Seq):
+    """Pads input_ids and the prompt-masked labels (with -100); drops the sampling-only `length`.
+
+    DataCollatorForLanguageModeling would overwrite labels with input_ids, undoing
+    the prompt mask, and since pad == eos here it would also mask every eos label.
+    """
+
+    def __call__(self, features, return_tensors=None):
+        features = [{k: v for k, v in f.items() if k != "length"} for f in features]
+        return super().__call__(features, return_tensors)
+
+
 class JobSearchLoRATrainer:
+    # Bump when tokenize_function's output changes so stale caches are not reused
+    TOKENIZATION_VERSION = 3
+    GRADIENT_CHECKPOINTING_KWARGS = {"use_reentrant": False}
+
     def __init__(self, config):
+        if torch.__version__ < "2.1":
+            raise RuntimeError(
+                f"torch >= 2.1 is required for non-reentrant gradient checkpointing (found {torch.__version__})"
+            )
+
         self.config = config
         self.tokenizer = None
         self.model = None
@@ -42,37 +70,85 @@ class JobSearchLoRATrainer:
         if self.tokenizer.pad_token is None:
             self.tokenizer.pad_token = self.tokenizer.eos_token
 
-        self.model = AutoModelForCausalLM.from_pretrained(
-            self.config.base_model,
-            cache_dir=self.config.cache_dir,
-            torch_dtype=torch.bfloat16,
-            device_map="auto",
-            trust_remote_code=True,
-            low_cpu_mem_usage=True,
-            offload_folder="./offload",
-        )
+        if torch.cuda.is_available():
+            # QLoRA: frozen NF4 base (a quarter of the bf16 weight bytes, so it fits in
+            # VRAM without CPU offload) with bf16 compute and bf16 LoRA adapters
+            bnb_config = BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_compute_dtype=torch.bfloat16,
+                bnb_4bit_use_double_quant=True,
+            )
+            self.model = self.load_base_model(
+                torch_dtype=torch.bfloat16,
+                quantization_config=bnb_config,
+                device_map="auto",
+                trust_remote_code=True,
+                low_cpu_mem_usage=True,
+            )
+        else:
+            # No GPU to spill from: keep every layer in CPU RAM. With device_map="auto"
+            # and an offload_folder, Accelerate would page weights from disk each forward
+            self.model = self.load_base_model(
+                torch_dtype=torch.bfloat16,
+                device_map={"": "cpu"},
+                trust_remote_code=True,
+                low_cpu_mem_usage=True,
+            )
 
         self.model.resize_token_embeddings(len(self.tokenizer))
 
-        if hasattr(self.model, "gradient_checkpointing_enable"):
-            try:
-                # Try newer PyTorch version with use_reentrant=False
-                self.model.gradient_checkpointing_enable(use_reentrant=False)
-            except TypeError:
-                # Fall back to older PyTorch version without use_reentrant
-                self.model.gradient_checkpointing_enable()
+        if getattr(self.model, "is_loaded_in_4bit", False):
+            self.model = prepare_model_for_kbit_training(self.model)
+
+        # prepare_model_for_kbit_training upcasts every non-quantized weight to fp32.
+        # The vocab-sized embeddings and lm_head are frozen and are most of those
+        # bytes, so they go back to bf16; the small norm layers stay fp32 for stability
+        for embeddings in (self.model.get_input_embeddings(), self.model.get_output_embeddings()):
+            if embeddings is not None:
+                embeddings.to(torch.bfloat16)
+
+        # Non-reentrant checkpointing: no duplicated recompute bookkeeping in backward.
+        # The RNG state is still preserved, since LoRA dropout must replay identically
+        self.model.gradient_checkpointing_enable(
+            gradient_checkpointing_kwargs=self.GRADIENT_CHECKPOINTING_KWARGS
+        )
+        self.model.enable_input_require_grads()
 
         print(f"✅ Model loaded with memory optimizations for 6GB VRAM")
 
+    def load_base_model(self, **kwargs):
+        """Load the base model with the fastest attention kernel it supports.
+
+        Flash Attention 2 (Ampere/Ada, needs the flash-attn package), then
+        PyTorch SDPA, then the eager implementation. from_pretrained raises
+        ValueError for an implementation the architecture does not support.
+        """
+        implementations = ["sdpa", "eager"]
+        if torch.cuda.is_available() and is_flash_attn_2_available():
+            implementations.insert(0, "flash_attention_2")
+
+        for implementation in implementations:
+            try:
+                model = AutoModelForCausalLM.from_pretrained(
+                    self.config.base_model,
+                    cache_dir=self.config.cache_dir,
+                    attn_implementation=implementation,
+                    **kwargs,
+                )
+            except ValueError as e:
+                if implementation == implementations[-1]:
+                    raise
+                print(f"⚠️ {implementation} attention unavailable ({e}), trying the next kernel")
+                continue
+            print(f"⚡ Attention implementation: {implementation}")
+            return model
+
     def setup_lora_config(self):
         print("🔧 Setting up LoRA configuration...")
 
-        if "gpt" in self.config.base_model.lower():
-            target_modules = ["c_attn", "c_proj"]
-        elif "llama" in self.config.base_model.lower():
-            target_modules = ["q_proj", "v_proj", "k_proj", "o_proj"]
-        else:
-            target_modules = self.config.lora_target_modules
+        target_modules = self.resolve_target_modules()
+        print(f"🎯 LoRA target modules: {target_modules}")
 
         lora_config = LoraConfig(
             task_type=TaskType.CAUSAL_LM,
@@ -89,40 +165,97 @@ class JobSearchLoRATrainer:
         print("✅ LoRA configuration applied")
         return lora_config
 
+    def resolve_target_modules(self) -> list:
+        """Configured LoRA targets if the model has them, else PEFT's defaults for its model_type"""
+        module_names = {name.rsplit(".", 1)[-1] for name, _ in self.model.named_modules()}
+        configured = list(self.config.lora_target_modules or [])
+        if configured and all(target in module_names for target in configured):
+            return configured
+
+        model_type = self.model.config.model_type
+        target_modules = TRANSFORMERS_MODELS_TO_LORA_TARGET_MODULES_MAPPING.get(model_type)
+        if target_modules is None:
+            raise ValueError(
+                f"lora_target_modules {configured} not found in the model and PEFT has "
+                f"no default target modules for model_type '{model_type}'"
+            )
+        return target_modules
+
+    def tokenized_cache_path(self, dataset: DatasetDict) -> str:
+        """Cache directory keyed on the tokenizer settings and the raw splits' fingerprints"""
+        key = json.dumps(
+            {
+                "base_model": self.config.base_model,
+                "model_max_length": self.config.model_max_length,
+                "format": self.TOKENIZATION_VERSION,
+                "splits": {name: split._fingerprint for name, split in dataset.items()},
+            },
+            sort_keys=True,
+        )
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        return os.path.join(self.config.cache_dir, f"tok-{digest}")
+
     def preprocess_dataset(self, dataset: DatasetDict) -> DatasetDict:
         print("🔄 Preprocessing dataset...")
 
-        def tokenize_function(examples):
-            texts = []
-            for inp, out in zip(examples["input"], examples["output"]):
-                text = f"{inp} {out}{self.tokenizer.eos_token}"
-                texts.append(text)
-
-            tokenized = self.tokenizer(
-                texts,
-                truncation=True,
-                padding=True,
-                max_length=self.config.model_max_length,
-                return_tensors="pt",
-            )
+        cache_path = self.tokenized_cache_path(dataset)
+        if os.path.exists(cache_path):
+            print(f"♻️ Loading tokenized dataset from {cache_path}")
+            return load_from_disk(cache_path)
 
-            tokenized["labels"] = tokenized["input_ids"].clone()
+        eos_token_id = self.tokenizer.eos_token_id
+        tokenizer = self.tokenizer
+        max_length = self.config.model_max_length
 
-            return tokenized
+        def tokenize_function(examples):
+            # Prompts and responses go through the Rust tokenizer as two batched calls,
+            # with no per-example string joins. The separating space leads the response
+            # so it merges into its first token as in joint tokenization
+            prompts = tokenizer(examples["input"])["input_ids"]
+            responses = tokenizer(
+                [" " + out for out in examples["output"]], add_special_tokens=False
+            )["input_ids"]
+
+            # Unpadded lists: Arrow stores only real tokens and the collator pads
+            # each batch (and derives labels) to that batch's longest example
+            input_ids, labels = [], []
+            for prompt, response in zip(prompts, responses):
+                # Nothing to learn if truncation would leave no response tokens
+                if len(prompt) >= max_length:
+                    continue
+                target = response + [eos_token_id]
+                input_ids.append((prompt + target)[:max_length])
+                # Loss (and its gradient) only on the response: prompt positions are -100
+                labels.append(([-100] * len(prompt) + target)[:max_length])
+
+            return {
+                "input_ids": input_ids,
+                "attention_mask": [[1] * len(ids) for ids in input_ids],
+                "labels": labels,
+                # Stored lengths let group_by_length sort without a pass over input_ids
+                "length": [len(ids) for ids in input_ids],
+            }
 
         tokenized_dataset = dataset.map(
             tokenize_function,
             batched=True,
+            num_proc=min(8, os.cpu_count() or 1),
             remove_columns=dataset["train"].column_names,
             desc="Tokenizing dataset",
         )
 
-        print("✅ Dataset preprocessed")
+        tokenized_dataset.save_to_disk(cache_path)
+        print(f"✅ Dataset preprocessed and cached to {cache_path}")
         return tokenized_dataset
 
     def setup_trainer(self, tokenized_dataset: DatasetDict):
         print("🔧 Setting up trainer...")
 
+        if torch.cuda.is_available():
+            # TF32 for any remaining fp32 matmuls (LoRA grads, fp32 norms)
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+
         training_args = TrainingArguments(
             output_dir=self.config.output_dir,
             num_train_epochs=self.config.num_train_epochs,
@@ -144,20 +277,29 @@ class JobSearchLoRATrainer:
             logging_steps=self.config.logging_steps,
             report_to=["tensorboard"],
             # Memory optimizations for 6GB VRAM
-            dataloader_pin_memory=False,  # Disable to save memory
+            # Tokenization is cached, so workers only pad and stack; pinned batches
+            # let the host-to-device copy overlap the previous step
+            dataloader_pin_memory=torch.cuda.is_available(),
             remove_unused_columns=False,
             bf16=True,  # Use BF16 instead of FP16 for better stability
             gradient_checkpointing=True,  # Enable gradient checkpointing
-            dataloader_num_workers=0,  # Reduce CPU overhead
+            # Trainer re-enables checkpointing itself; keep it non-reentrant there too
+            gradient_checkpointing_kwargs=self.GRADIENT_CHECKPOINTING_KWARGS,
+            dataloader_num_workers=2,
+            dataloader_persistent_workers=True,  # Keep workers alive across epochs and evals
             group_by_length=True,  # Group sequences by length for efficiency
+            length_column_name="length",  # Precomputed in preprocess_dataset
             # Additional memory optimizations
+            # Trainer checkpoints a PeftModel through its save_pretrained, so each
+            # save_steps write holds just the LoRA adapter, not the base weights
             save_safetensors=True,  # Use safer tensor format
-            torch_compile=False,  # Disable for compatibility
+            # 8-bit, CPU-paged optimizer state; the LoRA weights themselves stay bf16
+            optim="paged_adamw_8bit" if torch.cuda.is_available() else "adamw_torch",
         )
 
-        data_collator = DataCollatorForLanguageModeling(
+        data_collator = CausalLMDataCollator(
             tokenizer=self.tokenizer,
-            mlm=False,  # We're doing causal LM, not masked LM
+            label_pad_token_id=-100,
         )
 
         self.trainer = Trainer(
@@ -196,7 +338,9 @@ class JobSearchLoRATrainer:
     def save_model(self):
         print("💾 Saving model...")
 
-        self.peft_model.save_pretrained(self.config.output_dir)
+        # Adapter weights only (a few MB), as safetensors like the step checkpoints;
+        # peft 0.5 would otherwise default to a pickled adapter_model.bin
+        self.peft_model.save_pretrained(self.config.output_dir, safe_serialization=True)
 
         self.tokenizer.save_pretrained(self.config.output_dir)
 
@@ -273,18 +417,19 @@ class JobSearchLoRATrainer:
             raise ValueError("Model not trained yet")
 
         inputs = self.tokenizer(prompt, return_tensors="pt").to(self.peft_model.device)
+        prompt_length = inputs["input_ids"].shape[1]
 
-        with torch.no_grad():
+        # LoRA stays unmerged: peft 0.5 cannot merge into the 4-bit base, and the
+        # adapter may still be saved after these test generations
+        with torch.inference_mode():
             outputs = self.peft_model.generate(
                 **inputs,
-                max_length=max_length,
+                max_new_tokens=max_length,
                 temperature=0.7,
                 do_sample=True,
+                use_cache=True,
                 pad_token_id=self.tokenizer.eos_token_id,
             )
 
-        response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-
-        response = response[len(prompt) :].strip()
-
-        return response
+        # Decode only the generated tokens instead of re-slicing the prompt text
+        return self.tokenizer.decode(outputs[0, prompt_length:], skip_special_tokens=True).strip()
@@ -1,12 +1,25 @@
 import json
-import random
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any
 from dataclasses import dataclass
-import pandas as pd
-from datasets import Dataset, DatasetDict
-import re
+import numpy as np
+from datasets import Dataset, DatasetDict, Features, Value
 from pathlib import Path
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; fall back to plain substring checks
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+# Training prompt templates, shared by every example of a task
+REQUIREMENT_PROMPT_TEMPLATE = "Extract job requirements from: {}\nRequirements:"
+CONVERSATION_PROMPT_TEMPLATE = "User: {}\nAssistant:"
+TRAINING_FEATURES = Features({"input": Value("string"), "output": Value("string"), "task": Value("string")})
+
 
 @dataclass
 class JobSearchExample:
@@ -56,197 +69,231 @@ class JobSearchDatasetPreparer:
         
         self.experience_levels = ["entry-level", "junior", "mid-level", "senior", "lead", "principal"]
         self.job_types = ["full-time", "part-time", "contract", "remote", "hybrid"]
+        
+        # Keywords looked for in real job descriptions, found in one pass per description
+        self.senior_terms = ["senior", "lead", "principal", "staff"]
+        self.entry_terms = ["junior", "entry", "associate"]
+        self.description_vocabulary = sorted({
+            *(skill.lower() for skill_list in self.skills.values() for skill in skill_list),
+            *self.senior_terms, *self.entry_terms,
+            "remote", "contract", "part-time", "part time",
+        })
+        self.description_automaton = None
+        if ahocorasick is not None:
+            self.description_automaton = ahocorasick.Automaton()
+            for keyword in self.description_vocabulary:
+                self.description_automaton.add_word(keyword, keyword)
+            self.description_automaton.make_automaton()
     
     def generate_synthetic_training_data(self, num_samples: int = 5000) -> List[JobSearchExample]:
         """Generate synthetic training data for job search tasks"""
-        examples = []
+        rng = np.random.default_rng()
+        
+        # Same mix as drawing per example: 40% requirement extraction, then 30% of
+        # the rest (18%) job matching, and the remaining 42% conversation
+        kinds = rng.choice(3, size=num_samples, p=[0.4, 0.6 * 0.3, 0.6 * 0.7])
+        counts = np.bincount(kinds, minlength=3)
+        
+        # All random draws for each kind happen in bulk; only formatting is per example
+        generated = [
+            iter(self._generate_requirement_extraction_examples(counts[0], rng)),
+            iter(self._generate_job_matching_examples(counts[1], rng)),
+            iter(self._generate_conversation_examples(counts[2], rng)),
+        ]
+        return [next(generated[kind]) for kind in kinds]
+    
+    @staticmethod
+    def _sample_distinct(rng: np.random.Generator, count: int, population: int, k: int) -> np.ndarray:
+        """`k` distinct indices into range(population) for each of `count` rows"""
+        return rng.random((count, population)).argsort(axis=1)[:, :k]
+    
+    def _generate_requirement_extraction_examples(self, count: int, rng: np.random.Generator) -> List[JobSearchExample]:
+        """Generate requirement extraction training examples"""
+        job_titles = rng.choice(self.job_titles, size=count)
+        locations = rng.choice(self.locations, size=count)
+        experience_levels = rng.choice(self.experience_levels, size=count)
+        job_types = rng.choice(self.job_types, size=count)
+        templates = rng.choice(self.requirement_templates, size=count)
+        years = rng.choice(["2-3", "3-5", "5+", "7+"], size=count)
+        
+        # 60% chance to include two skills from each category
+        skill_lists = list(self.skills.values())
+        include = rng.random((count, len(skill_lists))) < 0.6
+        picks = [self._sample_distinct(rng, count, len(skill_list), 2) for skill_list in skill_lists]
         
-        for _ in range(num_samples):
-            # Generate requirement extraction examples
-            if random.random() < 0.4:
-                examples.append(self._generate_requirement_extraction_example())
+        examples = []
+        for i in range(count):
+            selected_skills = [
+                skill_list[j]
+                for c, skill_list in enumerate(skill_lists) if include[i, c]
+                for j in picks[c][i]
+            ]
+            job_title, location = str(job_titles[i]), str(locations[i])
+            experience_level, job_type = str(experience_levels[i]), str(job_types[i])
             
-            # Generate job matching examples
-            elif random.random() < 0.3:
-                examples.append(self._generate_job_matching_example())
+            # Generate user message
+            user_message = str(templates[i]).format(
+                job_title=job_title,
+                location=location,
+                experience_level=experience_level,
+                job_type=job_type,
+                skills=", ".join(selected_skills[:2]) if selected_skills else "programming",
+                additional_skills=", ".join(selected_skills[2:4]) if len(selected_skills) > 2 else "development",
+                years_experience=str(years[i])
+            )
             
-            # Generate conversation examples
-            else:
-                examples.append(self._generate_conversation_example())
+            # Create structured requirements
+            requirements = {
+                "keywords": job_title.lower(),
+                "location": location,
+                "experience_level": experience_level,
+                "job_type": job_type,
+                "skills": selected_skills[:4],
+                "company_type": "any"
+            }
+            
+            # Generate response
+            response = f"I'll help you find {job_title} positions. Let me search for {experience_level} roles in {location}."
+            
+            examples.append(JobSearchExample(
+                user_message=user_message,
+                extracted_requirements=requirements,
+                response=response,
+                task_type="requirement_extraction"
+            ))
         
         return examples
     
-    def _generate_requirement_extraction_example(self) -> JobSearchExample:
-        """Generate a requirement extraction training example"""
-        job_title = random.choice(self.job_titles)
-        location = random.choice(self.locations)
-        experience_level = random.choice(self.experience_levels)
-        job_type = random.choice(self.job_types)
-        
-        # Select random skills
-        selected_skills = []
-        for category, skill_list in self.skills.items():
-            if random.random() < 0.6:  # 60% chance to include skills from each category
-                selected_skills.extend(random.sample(skill_list, min(2, len(skill_list))))
-        
-        # Generate user message
-        template = random.choice(self.requirement_templates)
-        user_message = template.format(
-            job_title=job_title,
-            location=location,
-            experience_level=experience_level,
-            job_type=job_type,
-            skills=", ".join(selected_skills[:2]) if selected_skills else "programming",
-            additional_skills=", ".join(selected_skills[2:4]) if len(selected_skills) > 2 else "development",
-            years_experience=random.choice(["2-3", "3-5", "5+", "7+"])
-        )
-        
-        # Create structured requirements
-        requirements = {
-            "keywords": job_title.lower(),
-            "location": location,
-            "experience_level": experience_level,
-            "job_type": job_type,
-            "skills": selected_skills[:4],
-            "company_type": "any"
-        }
+    def _generate_job_matching_examples(self, count: int, rng: np.random.Generator) -> List[JobSearchExample]:
+        """Generate job matching training examples"""
+        all_skills = [skill for skills in self.skills.values() for skill in skills]
         
-        # Generate response
-        response = f"I'll help you find {job_title} positions. Let me search for {experience_level} roles in {location}."
+        job_titles = rng.choice(self.job_titles, size=count)
+        company_prefixes = rng.choice(['Tech', 'Innovation', 'Digital', 'Smart', 'Future'], size=count)
+        company_suffixes = rng.choice(['Corp', 'Solutions', 'Systems', 'Labs', 'Inc'], size=count)
+        locations = rng.choice(self.locations, size=count)
+        skill_picks = self._sample_distinct(rng, count, len(all_skills), 3)
+        match_scores = rng.uniform(0.6, 0.95, size=count)
         
-        return JobSearchExample(
-            user_message=user_message,
-            extracted_requirements=requirements,
-            response=response,
-            task_type="requirement_extraction"
-        )
-    
-    def _generate_job_matching_example(self) -> JobSearchExample:
-        """Generate a job matching training example"""
-        job_title = random.choice(self.job_titles)
-        company = f"{random.choice(['Tech', 'Innovation', 'Digital', 'Smart', 'Future'])} {random.choice(['Corp', 'Solutions', 'Systems', 'Labs', 'Inc'])}"
-        location = random.choice(self.locations)
-        
-        user_message = f"Is this {job_title} position at {company} in {location} a good match for me?"
-        
-        requirements = {
-            "keywords": job_title.lower(),
-            "location": location,
-            "experience_level": "any",
-            "job_type": "any",
-            "skills": random.sample([skill for skills in self.skills.values() for skill in skills], 3),
-            "company_type": "any"
-        }
-        
-        match_score = random.uniform(0.6, 0.95)
-        response = f"This {job_title} position at {company} looks like a {int(match_score*100)}% match based on your requirements. The location matches your preference for {location}."
+        examples = []
+        for i in range(count):
+            job_title, location = str(job_titles[i]), str(locations[i])
+            company = f"{company_prefixes[i]} {company_suffixes[i]}"
+            
+            user_message = f"Is this {job_title} position at {company} in {location} a good match for me?"
+            
+            requirements = {
+                "keywords": job_title.lower(),
+                "location": location,
+                "experience_level": "any",
+                "job_type": "any",
+                "skills": [all_skills[j] for j in skill_picks[i]],
+                "company_type": "any"
+            }
+            
+            response = f"This {job_title} position at {company} looks like a {int(match_scores[i]*100)}% match based on your requirements. The location matches your preference for {location}."
+            
+            examples.append(JobSearchExample(
+                user_message=user_message,
+                extracted_requirements=requirements,
+                response=response,
+                task_type="job_matching"
+            ))
         
-        return JobSearchExample(
-            user_message=user_message,
-            extracted_requirements=requirements,
-            response=response,
-            task_type="job_matching"
-        )
+        return examples
     
-    def _generate_conversation_example(self) -> JobSearchExample:
+    def _generate_conversation_examples(self, count: int, rng: np.random.Generator) -> List[JobSearchExample]:
         """Generate conversational training examples"""
+        # conversation type -> (possible user messages, assistant response)
         conversation_types = [
-            "follow_up", "clarification", "refinement", "feedback"
+            (  # follow_up
+                [
+                    "Can you show me more details about the first job?",
+                    "What other similar positions are available?",
+                    "Are there any remote options?",
+                    "Can you find jobs at larger companies?"
+                ],
+                "I'll search for additional opportunities that match your criteria."
+            ),
+            (  # clarification
+                [
+                    "I prefer remote work, can you update the search?",
+                    "Actually, I'm open to contract positions too",
+                    "I'd like to focus on senior-level roles only",
+                    "Can you include part-time opportunities?"
+                ],
+                "I've updated your preferences. Let me search again with the new criteria."
+            ),
+            (  # refinement
+                [
+                    "I want to add machine learning to my skill requirements",
+                    "Please exclude positions that require 10+ years experience",
+                    "I'm also interested in startup companies",
+                    "Can you focus on companies with good work-life balance?"
+                ],
+                "I've refined your search criteria. Here are the updated results."
+            ),
+            (  # feedback
+                [
+                    "These matches look great, thank you!",
+                    "The first few jobs seem perfect for me",
+                    "This is exactly what I was looking for",
+                    "Can you help me understand why these jobs match my profile?"
+                ],
+                "I'm glad these opportunities match what you're looking for! The matching algorithm considers your skills, experience, and location preferences."
+            ),
         ]
         
-        conv_type = random.choice(conversation_types)
-        
-        if conv_type == "follow_up":
-            user_message = random.choice([
-                "Can you show me more details about the first job?",
-                "What other similar positions are available?",
-                "Are there any remote options?",
-                "Can you find jobs at larger companies?"
-            ])
-            response = "I'll search for additional opportunities that match your criteria."
-        
-        elif conv_type == "clarification":
-            user_message = random.choice([
-                "I prefer remote work, can you update the search?",
-                "Actually, I'm open to contract positions too",
-                "I'd like to focus on senior-level roles only",
-                "Can you include part-time opportunities?"
-            ])
-            response = "I've updated your preferences. Let me search again with the new criteria."
-        
-        elif conv_type == "refinement":
-            user_message = random.choice([
-                "I want to add machine learning to my skill requirements",
-                "Please exclude positions that require 10+ years experience",
-                "I'm also interested in startup companies",
-                "Can you focus on companies with good work-life balance?"
-            ])
-            response = "I've refined your search criteria. Here are the updated results."
-        
-        else:  # feedback
-            user_message = random.choice([
-                "These matches look great, thank you!",
-                "The first few jobs seem perfect for me",
-                "This is exactly what I was looking for",
-                "Can you help me understand why these jobs match my profile?"
-            ])
-            response = "I'm glad these opportunities match what you're looking for! The matching algorithm considers your skills, experience, and location preferences."
-        
-        return JobSearchExample(
-            user_message=user_message,
-            extracted_requirements={},
-            response=response,
-            task_type="conversation"
-        )
+        type_ix = rng.integers(0, len(conversation_types), size=count)
+        message_ix = rng.integers(0, 4, size=count)
+        
+        examples = []
+        for conv_type, message in zip(type_ix, message_ix):
+            messages, response = conversation_types[conv_type]
+            examples.append(JobSearchExample(
+                user_message=messages[message],
+                extracted_requirements={},
+                response=response,
+                task_type="conversation"
+            ))
+        
+        return examples
     
     def create_training_dataset(self, examples: List[JobSearchExample]) -> DatasetDict:
         """Convert examples to HuggingFace dataset format"""
         
-        # Prepare data for different tasks
-        requirement_examples = []
-        conversation_examples = []
+        # Build the columns directly (requirement extraction first, then conversation)
+        # so Arrow converts three string lists instead of inferring a schema per row dict
+        columns = {"input": [], "output": [], "task": []}
         
         for example in examples:
             if example.task_type == "requirement_extraction":
                 # Format for requirement extraction task
-                prompt = f"Extract job requirements from: {example.user_message}\nRequirements:"
-                target = json.dumps(example.extracted_requirements)
-                
-                requirement_examples.append({
-                    "input": prompt,
-                    "output": target,
-                    "task": "requirement_extraction"
-                })
-            
-            else:
+                requirements = example.extracted_requirements
+                columns["input"].append(REQUIREMENT_PROMPT_TEMPLATE.format(example.user_message))
+                columns["output"].append(json.dumps(requirements) if requirements else "{}")
+                columns["task"].append("requirement_extraction")
+        
+        for example in examples:
+            if example.task_type != "requirement_extraction":
                 # Format for conversational task
-                prompt = f"User: {example.user_message}\nAssistant:"
-                target = example.response
-                
-                conversation_examples.append({
-                    "input": prompt,
-                    "output": target,
-                    "task": "conversation"
-                })
-        
-        # Combine all examples
-        all_examples = requirement_examples + conversation_examples
-        random.shuffle(all_examples)
-        
-        # Split into train/eval/test
-        total_size = len(all_examples)
+                columns["input"].append(CONVERSATION_PROMPT_TEMPLATE.format(example.user_message))
+                columns["output"].append(example.response)
+                columns["task"].append("conversation")
+        
+        # One Arrow table for every split; shuffle as an index permutation, not a Python list
+        dataset = Dataset.from_dict(columns, features=TRAINING_FEATURES)
+        dataset = dataset.shuffle(seed=getattr(self.config, "seed", None))
+        
+        # Split into train/eval/test (contiguous selects over the shuffled indices)
+        total_size = len(dataset)
         train_size = int(total_size * self.config.train_split_ratio)
         eval_size = int(total_size * self.config.eval_split_ratio)
         
-        train_data = all_examples[:train_size]
-        eval_data = all_examples[train_size:train_size + eval_size]
-        test_data = all_examples[train_size + eval_size:]
-        
-        # Create datasets
         dataset_dict = DatasetDict({
-            "train": Dataset.from_list(train_data),
-            "validation": Dataset.from_list(eval_data),
-            "test": Dataset.from_list(test_data)
+            "train": dataset.select(range(train_size)),
+            "validation": dataset.select(range(train_size, train_size + eval_size)),
+            "test": dataset.select(range(train_size + eval_size, total_size))
         })
         
         return dataset_dict
@@ -305,35 +352,42 @@ class JobSearchDatasetPreparer:
             "company_type": "any"
         }
         
-        description_lower = description.lower()
+        hits = self._description_keyword_hits(description.lower())
         
         # Extract experience level
-        if any(term in description_lower for term in ["senior", "lead", "principal", "staff"]):
+        if not hits.isdisjoint(self.senior_terms):
             requirements["experience_level"] = "senior"
-        elif any(term in description_lower for term in ["junior", "entry", "associate"]):
+        elif not hits.isdisjoint(self.entry_terms):
             requirements["experience_level"] = "entry"
         else:
             requirements["experience_level"] = "mid"
         
-        # Extract skills
-        found_skills = []
-        for category, skill_list in self.skills.items():
-            for skill in skill_list:
-                if skill.lower() in description_lower:
-                    found_skills.append(skill)
+        # Extract skills (in category order, as before)
+        found_skills = [
+            skill
+            for skill_list in self.skills.values()
+            for skill in skill_list
+            if skill.lower() in hits
+        ]
         
         requirements["skills"] = found_skills[:6]  # Limit to 6 skills
         
         # Extract job type
-        if "remote" in description_lower:
+        if "remote" in hits:
             requirements["job_type"] = "remote"
-        elif "contract" in description_lower:
+        elif "contract" in hits:
             requirements["job_type"] = "contract"
-        elif "part-time" in description_lower or "part time" in description_lower:
+        elif "part-time" in hits or "part time" in hits:
             requirements["job_type"] = "part-time"
         
         return requirements
     
+    def _description_keyword_hits(self, description_lower: str) -> set:
+        """Vocabulary keywords occurring anywhere in the description (substring semantics)"""
+        if self.description_automaton is not None:
+            return {keyword for _, keyword in self.description_automaton.iter(description_lower)}
+        return {keyword for keyword in self.description_vocabulary if keyword in description_lower}
+    
     def save_dataset(self, dataset: DatasetDict, path: str):
         """Save the prepared dataset"""
         Path(path).parent.mkdir(parents=True, exist_ok=True)
@@ -355,12 +409,17 @@ class JobSearchDatasetPreparer:
         dataset = self.create_training_dataset(all_examples)
         
         print("💾 Saving synthetic data...")
-        with open(self.config.synthetic_data_path, 'w') as f:
-            json.dump([{
-                "user_message": ex.user_message,
-                "extracted_requirements": ex.extracted_requirements,
-                "response": ex.response,
-                "task_type": ex.task_type
-            } for ex in all_examples], f, indent=2)
+        records = [{
+            "user_message": ex.user_message,
+            "extracted_requirements": ex.extracted_requirements,
+            "response": ex.response,
+            "task_type": ex.task_type
+        } for ex in all_examples]
+        # Must stay a top-level JSON array: the seed and migration scripts stream it with ijson.items(f, 'item')
+        if orjson is not None:
+            Path(self.config.synthetic_data_path).write_bytes(orjson.dumps(records, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.config.synthetic_data_path, 'w') as f:
+                json.dump(records, f, indent=2)
         
         return dataset
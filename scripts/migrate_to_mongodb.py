@@ -1,11 +1,10 @@
 #!/usr/bin/env python3
 
 import asyncio
-import json
 import os
 import sys
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Any, AsyncIterator, Dict, List
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
@@ -13,28 +12,32 @@ sys.path.append(str(Path(__file__).parent.parent))
 from database.connection import setup_database, get_database_stats, close_connections
 from database.models import JobPosting, TrainingExample
 from database.operations import JobOperations, TrainingOperations
+from utils.json_stream import aiter_json_batches
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional; the default asyncio loop works too
+    uvloop = None
 
-async def load_json_file(file_path: str) -> List[Dict[str, Any]]:
+# Jobs per insert_many round-trip; well under MongoDB's 100k maxWriteBatchSize
+BULK_BATCH = 1000
+
+
+async def iter_json_batches(file_path: str, batch_size: int = BULK_BATCH) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Stream a JSON file's records in batches; missing or unreadable files yield nothing"""
     if not os.path.exists(file_path):
         print(f"⚠️  File not found: {file_path}")
-        return []
+        return
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if isinstance(data, list):
-            return data
-        elif isinstance(data, dict):
-            return [data]
-        else:
-            print(f"⚠️  Unexpected data format in {file_path}")
-            return []
+        async for batch in aiter_json_batches(file_path, batch_size):
+            records = [item for item in batch if isinstance(item, dict)]
+            if len(records) < len(batch):
+                print(f"⚠️  Skipping {len(batch) - len(records)} non-object records in {file_path}")
+            yield records
     
     except Exception as e:
         print(f"❌ Error loading {file_path}: {e}")
-        return []
 
 
 async def migrate_jobs():
@@ -42,55 +45,65 @@ async def migrate_jobs():
     
     job_ops = JobOperations()
     migrated_count = 0
+    pending: List[JobPosting] = []
+    item_index = 0
     
     job_files = [
         "data/collected_jobs.json",
         "data/synthetic_job_data_small.json"
     ]
     
+    # One timestamp for the whole run instead of two utcnow() calls per job
+    now = datetime.utcnow()
+    
     for file_path in job_files:
         print(f"   📂 Processing {file_path}")
-        data = await load_json_file(file_path)
         
-        for item in data:
-            try:
-                job_data = {
-                    "url": item.get("url", f"synthetic_{migrated_count}"),
-                    "title": item.get("title", item.get("job_title", "Unknown")),
-                    "company": item.get("company", item.get("company_name", "Unknown")),
-                    "location": item.get("location", "Unknown"),
-                    "description": item.get("description", item.get("job_description", "")),
-                    "salary": item.get("salary", None),
-                    "requirements": item.get("requirements", []),
-                    "skills": item.get("skills", []),
-                    "experience_level": item.get("experience_level", None),
-                    "job_type": item.get("job_type", None),
-                    "remote": item.get("remote", None),
-                    "source": determine_source(file_path),
-                    "language": item.get("language", "english"),
-                    "country": item.get("country", None),
-                    "created_at": datetime.utcnow(),
-                    "scraped_at": datetime.utcnow()
-                }
-                
-                # Handle different field names
-                if "job_description" in item and not job_data["description"]:
-                    job_data["description"] = item["job_description"]
+        # Records are parsed a batch at a time, so memory stays at O(BULK_BATCH)
+        async for data in iter_json_batches(file_path):
+            for item in data:
+                item_index += 1
+                try:
+                    job_data = {
+                        "url": item.get("url", f"synthetic_{item_index}"),
+                        "title": item.get("title", item.get("job_title", "Unknown")),
+                        "company": item.get("company", item.get("company_name", "Unknown")),
+                        "location": item.get("location", "Unknown"),
+                        "description": item.get("description", item.get("job_description", "")),
+                        "salary": item.get("salary", None),
+                        "requirements": item.get("requirements", []),
+                        "skills": item.get("skills", []),
+                        "experience_level": item.get("experience_level", None),
+                        "job_type": item.get("job_type", None),
+                        "remote": item.get("remote", None),
+                        "source": determine_source(file_path),
+                        "language": item.get("language", "english"),
+                        "country": item.get("country", None),
+                        "created_at": now,
+                        "scraped_at": now
+                    }
+                    
+                    # Handle different field names
+                    if "job_description" in item and not job_data["description"]:
+                        job_data["description"] = item["job_description"]
+                    
+                    if "company_name" in item and job_data["company"] == "Unknown":
+                        job_data["company"] = item["company_name"]
+                    
+                    # Validated here so the stored documents keep the model's encoding
+                    pending.append(JobPosting(**job_data))
+                    
+                except Exception as e:
+                    print(f"   ⚠️  Error migrating job: {e}")
+                    continue
                 
-                if "company_name" in item and job_data["company"] == "Unknown":
-                    job_data["company"] = item["company_name"]
-                
-                job = JobPosting(**job_data)
-                
-                job_id = await job_ops.create_job(job)
-                migrated_count += 1
-                
-                if migrated_count % 10 == 0:
+                if len(pending) >= BULK_BATCH:
+                    migrated_count += await job_ops.bulk_create_jobs(pending)
+                    pending = []
                     print(f"   ✅ Migrated {migrated_count} jobs...")
-                
-            except Exception as e:
-                print(f"   ⚠️  Error migrating job: {e}")
-                continue
+    
+    if pending:
+        migrated_count += await job_ops.bulk_create_jobs(pending)
     
     print(f"✅ Migrated {migrated_count} job postings")
     return migrated_count
@@ -103,46 +116,49 @@ async def migrate_training_data():
     migrated_count = 0
     
     synthetic_file = "data/synthetic_job_data_small.json"
-    data = await load_json_file(synthetic_file)
-    
-    training_examples = []
+    offset = 0
     
-    for i, item in enumerate(data):
-        try:
-            job_desc = item.get("description", item.get("job_description", ""))
-            company = item.get("company", item.get("company_name", ""))
-            title = item.get("title", item.get("job_title", ""))
-            
-            if job_desc and title:
-                example = TrainingExample(
-                    example_id=f"synthetic_job_{i}",
-                    input_text=f"Find jobs for: {title} at {company}",
-                    output_text=f"Job Title: {title}\nCompany: {company}\nDescription: {job_desc[:500]}...",
-                    source="synthetic",
-                    language="english",
-                    task_type="job_matching"
-                )
-                training_examples.append(example)
-            
-            if job_desc:
-                requirements = item.get("requirements", [])
-                if requirements:
+    # Streamed in batches; example ids keep counting across them
+    async for data in iter_json_batches(synthetic_file):
+        training_examples = []
+        
+        for i, item in enumerate(data, start=offset):
+            try:
+                job_desc = item.get("description", item.get("job_description", ""))
+                company = item.get("company", item.get("company_name", ""))
+                title = item.get("title", item.get("job_title", ""))
+                
+                if job_desc and title:
                     example = TrainingExample(
-                        example_id=f"synthetic_req_{i}",
-                        input_text=f"Extract requirements from: {job_desc[:200]}...",
-                        output_text=f"Requirements: {', '.join(requirements)}",
+                        example_id=f"synthetic_job_{i}",
+                        input_text=f"Find jobs for: {title} at {company}",
+                        output_text=f"Job Title: {title}\nCompany: {company}\nDescription: {job_desc[:500]}...",
                         source="synthetic",
                         language="english",
-                        task_type="requirement_extraction"
+                        task_type="job_matching"
                     )
                     training_examples.append(example)
+                
+                if job_desc:
+                    requirements = item.get("requirements", [])
+                    if requirements:
+                        example = TrainingExample(
+                            example_id=f"synthetic_req_{i}",
+                            input_text=f"Extract requirements from: {job_desc[:200]}...",
+                            output_text=f"Requirements: {', '.join(requirements)}",
+                            source="synthetic",
+                            language="english",
+                            task_type="requirement_extraction"
+                        )
+                        training_examples.append(example)
+            
+            except Exception as e:
+                print(f"   ⚠️  Error creating training example: {e}")
+                continue
         
-        except Exception as e:
-            print(f"   ⚠️  Error creating training example: {e}")
-            continue
-    
-    if training_examples:
-        migrated_count = await training_ops.bulk_create_training_examples(training_examples)
+        offset += len(data)
+        if training_examples:
+            migrated_count += await training_ops.bulk_create_training_examples(training_examples)
     
     print(f"✅ Migrated {migrated_count} training examples")
     return migrated_count
@@ -214,6 +230,9 @@ async def main():
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     # Run migration
     try:
         asyncio.run(main())
@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import os
 import sys
 import uuid
 from datetime import datetime
@@ -12,10 +13,21 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from database.connection import get_async_database, close_connections
 from database.models import JobPosting, TrainingExample
+from utils.json_stream import aiter_json_batches
 from utils.logging_utils import setup_logging
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional; the default asyncio loop works too
+    uvloop = None
+
 logger = setup_logging(__name__)
 
+# Documents per insert_many round-trip (env SEED_BATCH_SIZE), capped at 10k. The seed
+# documents are small, so larger batches mostly just save round-trips; past tens of
+# thousands the batch lists start to grow the process RSS for little extra gain
+SEED_BATCH_SIZE = max(1, min(int(os.getenv("SEED_BATCH_SIZE", "1000")), 10000))
+
 
 async def clear_existing_data(db):
     try:
@@ -47,52 +59,53 @@ async def load_job_postings(db) -> bool:
             logger.warning(f"   Job postings file not found: {jobs_file}")
             return True  # Not critical, continue
         
-        with open(jobs_file, 'r', encoding='utf-8') as f:
-            jobs_data = json.load(f)
+        total_read = 0
+        total_inserted = 0
+        batch_number = 0
+        now = datetime.utcnow()  # shared by every document; datetimes are immutable
+        
+        # Parsed and inserted one batch at a time, so memory stays at O(SEED_BATCH_SIZE)
+        async for jobs_data in aiter_json_batches(jobs_file, SEED_BATCH_SIZE):
+            total_read += len(jobs_data)
+            job_docs = []
+            for job_data in jobs_data:
+                try:
+                    cleaned_job = {
+                        "url": job_data.get("url", ""),
+                        "title": job_data.get("title", "").replace("*", ""),  # Remove asterisks
+                        "company": job_data.get("company", "").replace("*", ""),
+                        "location": job_data.get("location", "").replace("*", ""),
+                        "description": job_data.get("description", ""),
+                        "source": job_data.get("source", "LinkedIn"),
+                        "language": "english",
+                        "created_at": now,
+                        "scraped_at": now,
+                        "skills": [],
+                        "requirements": [],
+                        "quality_score": 0.8,  # Default quality score
+                    }
+                    
+                    if not cleaned_job["url"] or not cleaned_job["title"]:
+                        continue
+                        
+                    job_docs.append(cleaned_job)
+                    
+                except Exception as e:
+                    logger.warning(f"   Skipping malformed job record: {e}")
+                    continue
+            
+            if job_docs:
+                batch_number += 1
+                result = await db.job_postings.insert_many(job_docs, ordered=False)
+                total_inserted += len(result.inserted_ids)
+                logger.info(f"   Inserted batch {batch_number}: {len(job_docs)} jobs")
         
-        if not jobs_data:
+        if not total_read:
             logger.warning("   No job data found in file")
             return True
         
-        logger.info(f"   Found {len(jobs_data)} job postings")
-        
-        job_docs = []
-        for job_data in jobs_data:
-            try:
-                cleaned_job = {
-                    "url": job_data.get("url", ""),
-                    "title": job_data.get("title", "").replace("*", ""),  # Remove asterisks
-                    "company": job_data.get("company", "").replace("*", ""),
-                    "location": job_data.get("location", "").replace("*", ""),
-                    "description": job_data.get("description", ""),
-                    "source": job_data.get("source", "LinkedIn"),
-                    "language": "english",
-                    "created_at": datetime.utcnow(),
-                    "scraped_at": datetime.utcnow(),
-                    "skills": [],
-                    "requirements": [],
-                    "quality_score": 0.8,  # Default quality score
-                }
-                
-                if not cleaned_job["url"] or not cleaned_job["title"]:
-                    continue
-                    
-                job_docs.append(cleaned_job)
-                
-            except Exception as e:
-                logger.warning(f"   Skipping malformed job record: {e}")
-                continue
-        
-        if job_docs:
-            batch_size = 100
-            total_inserted = 0
-            
-            for i in range(0, len(job_docs), batch_size):
-                batch = job_docs[i:i + batch_size]
-                result = await db.job_postings.insert_many(batch)
-                total_inserted += len(result.inserted_ids)
-                logger.info(f"   Inserted batch {i//batch_size + 1}: {len(batch)} jobs")
-            
+        logger.info(f"   Read {total_read} job postings")
+        if total_inserted:
             logger.info(f"✅ Successfully inserted {total_inserted} job postings")
         else:
             logger.warning("   No valid job postings to insert")
@@ -113,52 +126,53 @@ async def load_training_examples(db) -> bool:
             logger.warning(f"   Training data file not found: {training_file}")
             return True  
         
-        with open(training_file, 'r', encoding='utf-8') as f:
-            training_data = json.load(f)
+        total_read = 0
+        total_inserted = 0
+        batch_number = 0
+        now = datetime.utcnow()  # shared by every document; datetimes are immutable
+        
+        # Parsed and inserted one batch at a time, so memory stays at O(SEED_BATCH_SIZE)
+        async for training_data in aiter_json_batches(training_file, SEED_BATCH_SIZE):
+            training_docs = []
+            for idx, example in enumerate(training_data, start=total_read):
+                try:
+                    training_doc = {
+                        "example_id": f"synthetic_{idx}",
+                        "input_text": example.get("user_message", ""),
+                        "output_text": example.get("response", ""),
+                        "source": "synthetic",
+                        "language": "english",
+                        "task_type": example.get("task_type", "conversation"),
+                        "created_at": now,
+                        "quality_score": 0.9,  # High quality for synthetic data
+                    }
+                    
+                    # Add extracted requirements if available
+                    if example.get("extracted_requirements"):
+                        training_doc["prompt_template"] = json.dumps(example["extracted_requirements"])
+                    
+                    if not training_doc["input_text"] or not training_doc["output_text"]:
+                        continue
+                    
+                    training_docs.append(training_doc)
+                    
+                except Exception as e:
+                    logger.warning(f"   Skipping malformed training example {idx}: {e}")
+                    continue
+            total_read += len(training_data)
+            
+            if training_docs:
+                batch_number += 1
+                result = await db.training_examples.insert_many(training_docs, ordered=False)
+                total_inserted += len(result.inserted_ids)
+                logger.info(f"   Inserted batch {batch_number}: {len(training_docs)} examples")
         
-        if not training_data:
+        if not total_read:
             logger.warning("   No training data found in file")
             return True
         
-        logger.info(f"   Found {len(training_data)} training examples")
-        
-        training_docs = []
-        for idx, example in enumerate(training_data):
-            try:
-                training_doc = {
-                    "example_id": f"synthetic_{idx}",
-                    "input_text": example.get("user_message", ""),
-                    "output_text": example.get("response", ""),
-                    "source": "synthetic",
-                    "language": "english",
-                    "task_type": example.get("task_type", "conversation"),
-                    "created_at": datetime.utcnow(),
-                    "quality_score": 0.9,  # High quality for synthetic data
-                }
-                
-                # Add extracted requirements if available
-                if example.get("extracted_requirements"):
-                    training_doc["prompt_template"] = json.dumps(example["extracted_requirements"])
-                
-                if not training_doc["input_text"] or not training_doc["output_text"]:
-                    continue
-                
-                training_docs.append(training_doc)
-                
-            except Exception as e:
-                logger.warning(f"   Skipping malformed training example {idx}: {e}")
-                continue
-        
-        if training_docs:
-            batch_size = 100
-            total_inserted = 0
-            
-            for i in range(0, len(training_docs), batch_size):
-                batch = training_docs[i:i + batch_size]
-                result = await db.training_examples.insert_many(batch)
-                total_inserted += len(result.inserted_ids)
-                logger.info(f"   Inserted batch {i//batch_size + 1}: {len(batch)} examples")
-            
+        logger.info(f"   Read {total_read} training examples")
+        if total_inserted:
             logger.info(f"✅ Successfully inserted {total_inserted} training examples")
         else:
             logger.warning("   No valid training examples to insert")
@@ -264,5 +278,7 @@ async def main():
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     success = asyncio.run(main())
     sys.exit(0 if success else 1) 
\ No newline at end of file
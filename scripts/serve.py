@@ -17,6 +17,8 @@ def main():
                        help="Port to serve on (default: 8000)")
     parser.add_argument("--host", type=str, default="0.0.0.0",
                        help="Host to serve on (default: 0.0.0.0)")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="Worker processes, each with its own model copy (default: 1)")
     parser.add_argument("--force-base", action="store_true",
                        help="Force use of base model even if trained model exists")
     
@@ -40,7 +42,7 @@ def main():
     print("\n⚡ Starting server...")
 
     try:
-        run_server(host=args.host, port=args.port, trained_model_path=args.trained_model)
+        run_server(host=args.host, port=args.port, trained_model_path=args.trained_model, workers=args.workers)
     except KeyboardInterrupt:
         print("\n👋 Server stopped gracefully")
     except Exception as e:
@@ -250,6 +250,20 @@ def create_env_file():
     print("✅ .env file created")
 
 
+async def create_text_index(collection, keys, name):
+    """Create the named text index, dropping a differently named one left by older setups.
+
+    A collection holds a single text index, so the old default-named one would
+    make create_index fail with an options conflict.
+    """
+    indexes = await collection.index_information()
+    for index_name, spec in indexes.items():
+        if index_name != name and any(kind == pymongo.TEXT for _, kind in spec["key"]):
+            await collection.drop_index(index_name)
+            print(f"  🔄 Dropped old text index {index_name}")
+    await collection.create_index(keys, name=name)
+
+
 async def setup_indexes():
     """Setup MongoDB indexes for optimal performance"""
     print("📊 Setting up database indexes...")
@@ -263,7 +277,7 @@ async def setup_indexes():
     await jobs_collection.create_index([("source", pymongo.ASCENDING)])
     await jobs_collection.create_index([("language", pymongo.ASCENDING)])
     await jobs_collection.create_index([("created_at", pymongo.DESCENDING)])
-    await jobs_collection.create_index([("title", pymongo.TEXT), ("description", pymongo.TEXT), ("company", pymongo.TEXT)])
+    await create_text_index(jobs_collection, [("title", pymongo.TEXT), ("description", pymongo.TEXT), ("company", pymongo.TEXT)], "job_text_idx")
     print("  ✅ Job postings indexes created")
     
     # Training examples indexes
@@ -301,7 +315,7 @@ async def setup_indexes():
     await chat_collection.create_index([("user_id", pymongo.ASCENDING)])
     await chat_collection.create_index([("user_id", pymongo.ASCENDING), ("last_activity", pymongo.DESCENDING)])
     await chat_collection.create_index([("user_id", pymongo.ASCENDING), ("is_archived", pymongo.ASCENDING)])
-    await chat_collection.create_index([("title", pymongo.TEXT), ("messages.content", pymongo.TEXT)])
+    await create_text_index(chat_collection, [("title", pymongo.TEXT), ("messages.content", pymongo.TEXT)], "chat_text_idx")
     await chat_collection.create_index([("created_at", pymongo.DESCENDING)])
     await chat_collection.create_index([("last_activity", pymongo.DESCENDING)])
     print("  ✅ Chat histories indexes created")
@@ -55,6 +55,8 @@ function connectWebSocket() {
             const data = JSON.parse(event.data);
             if (data.type === 'job_search_response') {
                 handleJobSearchResponse(data.data);
+            } else if (data.type === 'job_search_progress') {
+                handleJobSearchProgress(data.stage, data.data);
             } else if (data.type === 'chat_history') {
                 handleChatHistoryResponse(data.data);
             } else if (data.type === 'error') {
@@ -288,6 +290,26 @@ function displayJobMatches(jobs) {
     displayMessage(jobsHtml, 'bot', true);
 }
 
+function handleJobSearchProgress(stage, data) {
+    const indicator = document.getElementById('typingIndicator');
+    if (!indicator) return;
+    
+    let status = indicator.querySelector('.typing-status');
+    if (!status) {
+        status = document.createElement('div');
+        status.className = 'typing-status';
+        indicator.querySelector('.typing-indicator').appendChild(status);
+    }
+    
+    if (stage === 'requirements_extracted') {
+        const keywords = data.requirements_extracted.keywords;
+        const terms = Array.isArray(keywords) ? keywords.join(', ') : (keywords || '');
+        status.textContent = terms ? `Searching for ${terms}...` : 'Searching...';
+    } else if (stage === 'jobs_found') {
+        status.textContent = `Found ${data.total_jobs_found} jobs, ranking matches...`;
+    }
+}
+
 function showTypingIndicator() {
     const container = document.getElementById('messagesContainer');
     const typingDiv = document.createElement('div');
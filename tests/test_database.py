@@ -0,0 +1,349 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import BulkWriteError
+from pymongo.results import InsertManyResult, InsertOneResult, UpdateResult
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import cache as cache_module
+from database import connection
+from database.cache import AsyncTTLCache
+from database.models import JobPosting, JobSearchRequest, TrainingExample
+from database.operations import ChatOperations, JobOperations, TrainingOperations, decode_job_cursor, encode_job_cursor
+
+
+def test_cache_single_flight():
+    """Concurrent callers for one key share a single fetch"""
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        cache = AsyncTTLCache(maxsize=8, ttl=30)
+        return await asyncio.gather(*(cache.get_or_fetch("key", fetch) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["value"] * 5
+    assert calls == 1
+
+
+def test_cache_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def run():
+        cache = AsyncTTLCache(maxsize=8, ttl=30)
+        first = await cache.get_or_fetch("key", fetch)
+        now[0] += 10
+        cached = await cache.get_or_fetch("key", fetch)
+        now[0] += 30
+        refreshed = await cache.get_or_fetch("key", fetch)
+        return first, cached, refreshed
+
+    assert asyncio.run(run()) == (1, 1, 2)
+
+
+def test_cache_does_not_keep_failures():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ValueError("unparseable")
+        return "value"
+
+    async def run():
+        cache = AsyncTTLCache(maxsize=8, ttl=30)
+        with pytest.raises(ValueError):
+            await cache.get_or_fetch("key", fetch)
+        return await cache.get_or_fetch("key", fetch)
+
+    assert asyncio.run(run()) == "value"
+    assert calls == 2
+
+
+def test_job_cursor_round_trip():
+    created_at = datetime(2024, 5, 17, 9, 30, 15, 123000, tzinfo=timezone.utc)
+    job_id = ObjectId()
+
+    assert decode_job_cursor(encode_job_cursor(created_at, job_id)) == (created_at, job_id)
+
+
+def test_job_cursor_accepts_naive_mongo_datetimes():
+    """Mongo returns naive UTC datetimes; the cursor decodes them as UTC"""
+    created_at = datetime(2024, 5, 17, 9, 30, 15, 123000)
+    job_id = ObjectId()
+
+    decoded_at, decoded_id = decode_job_cursor(encode_job_cursor(created_at, job_id))
+
+    assert decoded_at == created_at.replace(tzinfo=timezone.utc)
+    assert decoded_id == job_id
+
+
+class FakeCollection:
+    """Just enough of an async collection for the write paths; unique applies to url"""
+
+    def __init__(self, name, docs=(), indexes=None, unique=False):
+        self.name = name
+        self.docs = list(docs)
+        self.indexes = indexes or {"_id_": {"key": [("_id", 1)]}}
+        self.unique = unique
+        self.inserted = []
+
+    async def index_information(self):
+        return self.indexes
+
+    async def drop_index(self, name):
+        del self.indexes[name]
+
+    async def create_index(self, keys, name):
+        self.indexes[name] = {"key": keys}
+
+    async def create_indexes(self, index_models):
+        for index_model in index_models:
+            document = index_model.document
+            field = next(iter(document["key"]))
+            if document.get("unique") and len({doc[field] for doc in self.docs}) < len(self.docs):
+                raise RuntimeError("E11000 duplicate key error")
+            self.indexes[document["name"]] = {"key": list(document["key"].items()), "unique": document.get("unique", False)}
+
+    async def distinct(self, field, query):
+        wanted = set(query[field]["$in"])
+        return list({doc[field] for doc in self.docs if doc[field] in wanted})
+
+    async def find_one(self, query, projection=None):
+        return next((doc for doc in self.docs if all(doc.get(k) == v for k, v in query.items())), None)
+
+    async def insert_one(self, doc):
+        self.docs.append(doc)
+        self.inserted.append(doc)
+        return InsertOneResult(doc.get("_id"), acknowledged=True)
+
+    async def insert_many(self, docs, ordered=True, bypass_document_validation=False):
+        stored = {doc["url"] for doc in self.docs}
+        fresh = [doc for doc in docs if doc["url"] not in stored]
+        self.docs.extend(fresh)
+        self.inserted.extend(fresh)
+        if self.unique and len(fresh) < len(docs):
+            raise BulkWriteError({"nInserted": len(fresh), "writeErrors": []})
+        if len(fresh) < len(docs):
+            raise AssertionError("duplicate inserted without a unique index")
+        return InsertManyResult([doc.get("_id") for doc in fresh], acknowledged=True)
+
+
+def make_job(url):
+    return JobPosting(url=url, title="Python Developer", company="Acme", location="Tbilisi", source="linkedin")
+
+
+def with_collection(ops, collection):
+    async def get_collection():
+        return collection
+
+    ops.get_collection = get_collection
+    connection._unique_confirmed.clear()
+    return ops
+
+
+def bulk_insert(collection, jobs):
+    return asyncio.run(with_collection(JobOperations(), collection).bulk_create_jobs(jobs))
+
+
+def test_bulk_create_jobs_skips_stored_urls_without_unique_index():
+    """A non-unique url index does not reject duplicates, so stored URLs are filtered first"""
+    collection = FakeCollection("jobs", docs=[{"url": "https://jobs/1"}],
+                                indexes={"url_1": {"key": [("url", 1)]}})
+
+    inserted = bulk_insert(collection, [make_job("https://jobs/1"), make_job("https://jobs/2"), make_job("https://jobs/2")])
+
+    assert inserted == 1
+    assert [doc["url"] for doc in collection.inserted] == ["https://jobs/2"]
+
+
+def test_bulk_create_jobs_counts_inserts_past_duplicate_key_errors():
+    collection = FakeCollection("jobs", docs=[{"url": "https://jobs/1"}],
+                                indexes={"url_1": {"key": [("url", 1)], "unique": True}}, unique=True)
+
+    inserted = bulk_insert(collection, [make_job("https://jobs/1"), make_job("https://jobs/2")])
+
+    assert inserted == 1
+    assert [doc["url"] for doc in collection.inserted] == ["https://jobs/2"]
+
+
+def test_non_unique_index_is_rebuilt_as_unique():
+    collection = FakeCollection("jobs", indexes={"url_1": {"key": [("url", 1)]}})
+
+    asyncio.run(connection.rebuild_non_unique_indexes(collection, [IndexModel([("url", ASCENDING)], unique=True)]))
+
+    assert collection.indexes["url_1"]["unique"]
+
+
+def test_index_stays_non_unique_while_duplicates_are_stored():
+    collection = FakeCollection("jobs", docs=[{"url": "https://jobs/1"}, {"url": "https://jobs/1"}],
+                                indexes={"url_1": {"key": [("url", 1)]}})
+
+    async def run():
+        connection._unique_confirmed.clear()
+        await connection.rebuild_non_unique_indexes(collection, [IndexModel([("url", ASCENDING)], unique=True)])
+        return await connection.unique_index_confirmed(collection, "url")
+
+    assert asyncio.run(run()) is False
+    assert collection.indexes["url_1"] == {"key": [("url", 1)]}
+
+
+def test_create_training_example_checks_first_without_unique_index():
+    stored_id = ObjectId()
+    collection = FakeCollection("training_examples", docs=[{"_id": stored_id, "example_id": "ex-1"}],
+                                indexes={"example_id_1": {"key": [("example_id", 1)]}})
+    ops = with_collection(TrainingOperations(), collection)
+    example = TrainingExample(example_id="ex-1", input_text="in", output_text="out", source="synthetic", task_type="chat")
+
+    assert asyncio.run(ops.create_training_example(example)) == str(stored_id)
+    assert collection.inserted == []
+
+
+class SearchCollection:
+    """Records search_jobs pipelines and returns the stored page"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.pipelines = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        docs = self.docs
+
+        class Cursor:
+            async def to_list(self, length):
+                return [dict(doc) for doc in docs]
+
+        return Cursor()
+
+    async def count_documents(self, query):
+        return len(self.docs)
+
+    async def estimated_document_count(self):
+        return len(self.docs)
+
+
+def stored_job(url):
+    return {"_id": ObjectId(), "url": url, "title": "Python Developer", "company": "Acme",
+            "location": "Tbilisi", "source": "linkedin", "created_at": datetime(2024, 5, 17)}
+
+
+def test_search_cache_is_per_instance_and_returns_copies():
+    first = with_collection(JobOperations(), SearchCollection([stored_job("https://jobs/1")]))
+    second = with_collection(JobOperations(), SearchCollection([stored_job("https://jobs/2")]))
+    request = JobSearchRequest(query="")
+
+    async def run():
+        page = await first.search_jobs(request)
+        page.jobs.clear()
+        return await first.search_jobs(request), await second.search_jobs(request)
+
+    cached, other = asyncio.run(run())
+
+    assert [job.url for job in cached.jobs] == ["https://jobs/1"]
+    assert [job.url for job in other.jobs] == ["https://jobs/2"]
+
+
+def test_search_jobs_seeks_past_the_cursor():
+    """A cursor page seeks on (created_at, _id) in the $match instead of skipping"""
+    last = stored_job("https://jobs/1")
+    collection = SearchCollection([last])
+    ops = with_collection(JobOperations(), collection)
+    cursor = encode_job_cursor(last["created_at"], last["_id"])
+
+    async def run():
+        first = await ops.search_jobs(JobSearchRequest(query="", limit=1))
+        second = await ops.search_jobs(JobSearchRequest(query="", limit=1, cursor=first.next_cursor))
+        return first, second
+
+    first, _ = asyncio.run(run())
+    first_page, second_page = collection.pipelines
+
+    assert first.next_cursor == cursor
+    assert first_page[2:4] == [{"$limit": 1}, {"$skip": 0}]
+    after_ts, after_id = decode_job_cursor(cursor)
+    assert second_page[0]["$match"]["$or"] == [
+        {"created_at": {"$lt": after_ts}},
+        {"created_at": after_ts, "_id": {"$lt": after_id}},
+    ]
+    assert second_page[1] == {"$sort": {"created_at": -1, "_id": -1}}
+    assert second_page[2:] == [{"$limit": 1}, {"$project": {"description": 0, "requirements": 0, "match_keywords": 0}}]
+
+
+class ChatCollection:
+    """One stored chat; records which write path save_chat took"""
+
+    def __init__(self, stored, matched=1):
+        self.stored = stored
+        self.matched = matched
+        self.updates = []
+        self.replaced = []
+
+    async def find_one(self, query, projection=None):
+        return self.stored
+
+    async def update_one(self, query, update):
+        self.updates.append((query, update))
+        return UpdateResult({"n": self.matched, "nModified": self.matched}, acknowledged=True)
+
+    async def find_one_and_update(self, query, pipeline, **kwargs):
+        self.replaced.append(pipeline)
+        return {"_id": self.stored["_id"]}
+
+
+def chat(*message_ids, jobs=0):
+    messages = [{"id": message_id, "content": message_id, "sender": "user"} for message_id in message_ids]
+    messages[-1].update(sender="bot", jobs=[{"title": "Python Developer"}] * jobs)
+    return {"id": "chat-1", "title": "Python jobs", "messages": messages}
+
+
+def test_save_chat_pushes_only_new_messages():
+    collection = ChatCollection({"_id": ObjectId(), "last_message_seq": 2, "messages": [{"message_id": "m2"}]})
+    ops = with_collection(ChatOperations(), collection)
+
+    asyncio.run(ops.save_chat(chat("m1", "m2", "m3", "m4", jobs=3)))
+
+    ((query, update),) = collection.updates
+    assert query["last_message_seq"] == 2
+    assert [m["message_id"] for m in update["$push"]["messages"]["$each"]] == ["m3", "m4"]
+    assert update["$inc"] == {"message_count": 2, "jobs_found_total": 3, "job_searches_count": 1}
+    assert update["$set"]["last_message_seq"] == 4
+    assert collection.replaced == []
+
+
+def test_save_chat_replaces_edited_history():
+    collection = ChatCollection({"_id": ObjectId(), "last_message_seq": 2, "messages": [{"message_id": "old"}]})
+    ops = with_collection(ChatOperations(), collection)
+
+    asyncio.run(ops.save_chat(chat("m1", "m2", "m3")))
+
+    assert collection.updates == []
+    assert len(collection.replaced) == 1
+
+
+def test_save_chat_replaces_after_a_lost_append_race():
+    collection = ChatCollection({"_id": ObjectId(), "last_message_seq": 1, "messages": [{"message_id": "m1"}]}, matched=0)
+    ops = with_collection(ChatOperations(), collection)
+
+    asyncio.run(ops.save_chat(chat("m1", "m2")))
+
+    assert len(collection.updates) == 1
+    assert len(collection.replaced) == 1
@@ -0,0 +1,113 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference.job_matcher import JobMatcher
+
+
+def test_remote_job_type_keeps_jobs_with_remote_location():
+    """Scraped cards have no description; a 'Remote' location still satisfies job_type"""
+    job = {'title': 'Python Developer', 'company': 'Acme', 'location': 'Remote', 'description': ''}
+    requirements = {'keywords': 'python developer', 'job_type': 'remote'}
+
+    matched = JobMatcher().match_jobs([job], requirements)
+
+    assert len(matched) == 1
+    assert matched[0]['title'] == 'Python Developer'
+
+
+def test_job_type_keeps_jobs_without_description():
+    job = {'title': 'Data Engineer', 'company': 'Acme', 'location': 'Tbilisi', 'description': ''}
+
+    assert JobMatcher().meets_criteria(job, {'job_type': 'contract'})
+
+
+def test_job_type_drops_full_postings_that_never_mention_it():
+    matcher = JobMatcher()
+    onsite = {'title': 'Data Engineer', 'location': 'Tbilisi', 'description': 'Full-time office role'}
+    flagged = {'title': 'Data Engineer', 'location': 'Tbilisi', 'description': 'Office role', 'remote': True}
+
+    assert not matcher.meets_criteria(onsite, {'job_type': 'remote'})
+    assert matcher.meets_criteria(flagged, {'job_type': 'remote'})
+
+
+def test_missing_title_and_location_get_neutral_scores():
+    """Scraped cards can carry None fields; they score neutral instead of raising"""
+    job = {'title': None, 'company': 'Acme', 'location': None, 'description': 'python'}
+    requirements = {'keywords': 'python developer', 'location': 'Tbilisi', 'skills': ['python']}
+
+    matcher = JobMatcher()
+
+    assert len(matcher.match_jobs([job], requirements)) == 1
+    _, breakdown = matcher.score_breakdown(job, requirements)
+    assert breakdown['title'] == 0.5
+    assert breakdown['location'] == 0.7
+
+
+def test_java_keyword_does_not_match_javascript_title():
+    matcher = JobMatcher()
+
+    # fuzzy_score=0.0 isolates the whole-word match from the fuzzy fallback
+    assert matcher.match_title_keywords("JavaScript Developer", "java", fuzzy_score=0.0) == 0.0
+    assert matcher.match_title_keywords("Senior Java Developer", "java", fuzzy_score=0.0) == 1.0
+
+
+def test_title_tokens_split_on_punctuation_but_keep_symbols():
+    matcher = JobMatcher()
+
+    assert matcher.match_title_keywords("Java/Kotlin Engineer", "java kotlin", fuzzy_score=0.0) == 1.0
+    assert matcher.match_title_keywords("C++ Developer", "c++", fuzzy_score=0.0) == 1.0
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("python jobs in batumi", "in "),
+    ("i want to begin at tbilisi", "at "),
+    ("remote work from kutaisi", "from "),
+    ("something near rustavi", "near "),
+])
+def test_location_indicator_starts_a_word(message, expected):
+    server = pytest.importorskip("inference.server")
+
+    match = server.LOCATION_INDICATOR_RE.search(message)
+
+    assert match is not None
+    assert match.group() == expected
+
+
+def test_location_indicator_ignores_word_endings():
+    server = pytest.importorskip("inference.server")
+
+    # "begin " and "margin " end in "in " but don't start one
+    assert server.LOCATION_INDICATOR_RE.search("begin margin plugin") is None
+
+
+def test_title_scores_match_across_the_tfidf_threshold():
+    """Large catalogs only prefilter with TF-IDF; shortlisted titles score the same as below it"""
+    jobs = [
+        {'title': 'Senior Python Developer', 'location': 'Tbilisi', 'description': 'python django'},
+        {'title': 'Accountant', 'location': 'Tbilisi', 'description': 'bookkeeping'},
+    ]
+    requirements = {'keywords': 'python developer', 'skills': ['python']}
+
+    small = JobMatcher(tfidf_min_jobs=500).batch_fuzzy_scores(jobs, requirements)[0]
+    large = JobMatcher(tfidf_min_jobs=1).batch_fuzzy_scores(jobs, requirements)[0]
+
+    assert large[0] == pytest.approx(small[0])
+    assert large[1] == 0.0
+
+
+def test_top_k_keeps_input_order_for_tied_scores():
+    # Every third job is a tied title match; the rest tie on a lower score
+    jobs = [{'title': 'Python Developer' if i % 3 == 0 else 'Accountant', 'company': f'Company {i}',
+             'location': 'Tbilisi', 'description': ''} for i in range(300)]
+    requirements = {'keywords': 'python developer'}
+
+    matcher = JobMatcher()
+    ranked = matcher.match_jobs(jobs, requirements)
+    top = matcher.match_jobs(jobs, requirements, top_k=10)
+
+    assert [job['company'] for job in top] == [job['company'] for job in ranked[:10]]
+    assert [job['company'] for job in top] == [f'Company {i}' for i in range(0, 30, 3)]
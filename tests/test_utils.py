@@ -0,0 +1,62 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import json_stream
+from utils.json_stream import aiter_json_batches, iter_json_items
+
+
+@pytest.fixture(params=["ijson", "whole-file"])
+def parser(request, monkeypatch):
+    """Run each test with ijson streaming and with the whole-file fallback"""
+    if request.param == "ijson":
+        if json_stream.ijson is None:
+            pytest.skip("ijson not installed")
+    else:
+        monkeypatch.setattr(json_stream, "ijson", None)
+    return request.param
+
+
+def write(tmp_path, text):
+    path = tmp_path / "data.json"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_array_items(tmp_path, parser):
+    path = write(tmp_path, '  [{"title": "Python Developer", "score": 0.5}, {"title": "თბილისი"}]')
+
+    assert list(iter_json_items(path)) == [{"title": "Python Developer", "score": 0.5}, {"title": "თბილისი"}]
+
+
+def test_floats_stay_floats(tmp_path, parser):
+    path = write(tmp_path, '[{"score": 0.25}]')
+
+    (item,) = iter_json_items(path)
+
+    assert type(item["score"]) is float
+
+
+def test_top_level_object_is_one_item(tmp_path, parser):
+    path = write(tmp_path, '{"title": "Data Scientist"}')
+
+    assert list(iter_json_items(path)) == [{"title": "Data Scientist"}]
+
+
+def test_scalar_yields_nothing(tmp_path, parser):
+    path = write(tmp_path, '42')
+
+    assert list(iter_json_items(path)) == []
+
+
+def test_async_batches(tmp_path, parser):
+    path = write(tmp_path, "[1, 2, 3, 4, 5]")
+
+    async def collect():
+        return [batch async for batch in aiter_json_batches(path, 2)]
+
+    assert asyncio.run(collect()) == [[1, 2], [3, 4], [5]]
@@ -0,0 +1,50 @@
+import asyncio
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, List, Union
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; fall back to parsing the whole file
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+
+def iter_json_items(path: Union[str, Path]) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array one at a time.
+
+    With ijson only the current item is held in memory. A top-level object
+    is yielded as a single item, and anything else yields nothing.
+    """
+    with open(path, "rb") as f:
+        head = f.read(1)
+        while head.isspace():
+            head = f.read(1)
+        f.seek(0)
+
+        if head == b"[" and ijson is not None:
+            yield from ijson.items(f, "item", use_float=True)
+            return
+
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    if isinstance(data, list):
+        yield from data
+    elif isinstance(data, dict):
+        yield data
+
+
+async def aiter_json_batches(path: Union[str, Path], batch_size: int) -> AsyncIterator[List[Any]]:
+    """Async batches of iter_json_items; the reading and parsing run in a worker thread"""
+    items = iter_json_items(path)
+    while True:
+        batch = await asyncio.to_thread(lambda: list(islice(items, batch_size)))
+        if not batch:
+            return
+        yield batch